@@ -21,7 +21,9 @@ class ClosestNodeAssignment(AssignmentStrategy):
         best_path = None
 
         for compute_node in nodes:
-            distance = request.current_node.position.distance_to(compute_node.position)
+            distance = request.current_node.position.distance_squared_to(
+                compute_node.position
+            )
 
             if distance < best_distance:
                 best_distance = distance
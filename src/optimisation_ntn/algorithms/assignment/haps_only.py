@@ -29,7 +29,7 @@ class HAPSOnlyAssignment(AssignmentStrategy):
         best_path = None
 
         for haps in haps_nodes:
-            distance = request.current_node.position.distance_to(haps.position)
+            distance = request.current_node.position.distance_squared_to(haps.position)
             if distance < best_distance:
                 best_distance = distance
                 best_node = haps
@@ -27,8 +27,8 @@ class AssignmentStrategyFactory:
         "QLearning": QLearningAssignment,
     }
 
-    # Add optimization algorithms as valid strategies
-    _optimization_strategies = {"GA", "PSO", "DE"}
+    # Add optimization algorithms as valid strategies, in a stable order
+    _optimization_strategies = ("GA", "DE", "PSO")
 
     @classmethod
     def get_strategy(
@@ -74,6 +74,11 @@ class AssignmentStrategyFactory:
             raise ValueError("Strategy must inherit from AssignmentStrategy")
         cls._strategies[name] = strategy_class
 
+    @classmethod
+    def optimization_strategies(cls) -> tuple[str, ...]:
+        """Get the names of the optimization algorithms"""
+        return cls._optimization_strategies
+
     @classmethod
     def available_strategies(cls) -> list[str]:
         """Get list of available strategy names"""
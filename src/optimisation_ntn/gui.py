@@ -3,26 +3,28 @@
 import ctypes
 import platform
 import sys
+import time
 
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from optimisation_ntn.networks.request import RequestStatus
+from optimisation_ntn.ui.assets import Assets
 from optimisation_ntn.ui.dialogs.enlarged_graph import EnlargedGraphDialog
 from optimisation_ntn.ui.graphs import EnergyGraph
 from optimisation_ntn.ui.simulation_controls import SimulationControls
+from optimisation_ntn.ui.simulation_worker import NetworkSnapshot, SimulationSnapshot
 from optimisation_ntn.ui.stats_table import NodeStatsTable
 from optimisation_ntn.ui.theme_manager import ThemeManager
 from optimisation_ntn.ui.views import CloseUpView, FarView
 
-# Task bar Icon on Windows
-if platform.system() == "Windows":
-    ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID("optimisation_ntn")
-
 
 # pylint: disable=too-many-instance-attributes
 class SimulationUI(QtWidgets.QMainWindow):
     """Main GUI class"""
 
+    RENDER_COST_SMOOTHING = 0.2  # Weight of the latest frame in the render cost
+    VIEW_REFRESH_DELAY = 20  # ms to wait for further node changes before redrawing
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Optimisation NTN")
@@ -30,9 +32,15 @@ class SimulationUI(QtWidgets.QMainWindow):
         self.current_view = "close"
         self.show_links = True
         self.is_dark_theme = True
+        self._applied_theme = None  # Theme of the current stylesheet
         self.setWindowIcon(QtGui.QIcon("images/logo.png"))
 
         self.schematic_view = QtWidgets.QGraphicsView()
+        # Keep the rendered sky and floor instead of repainting them each frame
+        self.schematic_view.setCacheMode(
+            QtWidgets.QGraphicsView.CacheModeFlag.CacheBackground
+        )
+        self.close_up_view = CloseUpView()
         self.view_toggle_btn = QtWidgets.QPushButton("Switch to Far View")
         self.node_stats_table = NodeStatsTable()
         self.show_links_checkbox = QtWidgets.QCheckBox("Show Communication Links")
@@ -41,15 +49,42 @@ class SimulationUI(QtWidgets.QMainWindow):
         self.current_energy_label = QtWidgets.QLabel("0.0 J")
         self.simulation_rate_label = QtWidgets.QLabel("0.0 steps/s")
         self.last_step_time = None
-
-        # Add UI refresh timer with 5 Hz (200ms)
+        self._label_texts = {}  # Text last shown by each info label
+
+        # Snapshots reported by the simulation worker since the last redraw,
+        # the GUI never reads the state of a running simulation
+        self._pending_progress = []
+        # Latest snapshot shown, and latest energy of every node
+        self.latest_progress = None
+        self._node_energy = {}
+        # Latest state of the network, drawn by the views
+        self._network_state = None
+
+        # Redraw at most once per screen refresh, only while steps come in
         self.ui_refresh_timer = QtCore.QTimer()
+        self.ui_refresh_timer.setInterval(self.render_interval())
         self.ui_refresh_timer.timeout.connect(self.refresh_ui)
-        self.ui_refresh_timer.start(200)  # 5 Hz refresh rate
+
+        # Redraw once after a burst of node count changes
+        self.view_refresh_timer = QtCore.QTimer()
+        self.view_refresh_timer.setSingleShot(True)
+        self.view_refresh_timer.setInterval(self.VIEW_REFRESH_DELAY)
+        self.view_refresh_timer.timeout.connect(self.update_view)
+
+        # Whether the animation tab holding the schematic view is shown
+        self._schematic_visible = True
+
+        # Set by simulation steps, cleared once the UI has been redrawn
+        self._view_dirty = False
+
+        # Moving average of the time spent drawing a frame, in seconds
+        self._render_cost = 0.0
+        self._last_render = 0.0
 
         # Add trackers for last plotted points
         self.last_total_energy_index = 0
         self.node_energy_indices = {}
+        self._checked_keys = set()  # Display keys of the nodes checked in the table
 
         # Add rate tracking for rolling average
         self.rate_history = []
@@ -59,6 +94,11 @@ class SimulationUI(QtWidgets.QMainWindow):
         self.init_ui()
         self.apply_theme()
 
+        # Decode node images off the GUI thread and redraw once they are ready
+        assets = Assets.instance()
+        assets.loaded.connect(self.update_view)
+        assets.load_all()
+
     def init_ui(self):
         """Initialize the UI"""
         main_layout = QtWidgets.QHBoxLayout()
@@ -87,6 +127,7 @@ class SimulationUI(QtWidgets.QMainWindow):
         tabs = QtWidgets.QTabWidget()
         tabs.addTab(self.create_real_time_view(), "Animation view")
         tabs.addTab(self.create_results_tab(), "Graph selection")
+        tabs.currentChanged.connect(self.on_tab_changed)
         center_layout.addWidget(tabs)
         upper_content.addLayout(center_layout, 2)
 
@@ -122,6 +163,11 @@ class SimulationUI(QtWidgets.QMainWindow):
 
     def apply_theme(self):
         """Apply the current theme to all components"""
+        # Restyling every widget is expensive, only do it on theme changes
+        if self._applied_theme == self.is_dark_theme:
+            return
+        self._applied_theme = self.is_dark_theme
+
         # Apply stylesheet
         self.setStyleSheet(ThemeManager.get_theme_stylesheet(self.is_dark_theme))
 
@@ -292,24 +338,42 @@ class SimulationUI(QtWidgets.QMainWindow):
             self.view_toggle_btn.setText("Switch to Far View")
         self.update_view()
 
+    def on_tab_changed(self, index):
+        """Only draw the schematic view while its tab is shown"""
+        self._schematic_visible = index == 0
+        if self._schematic_visible:
+            self.update_view()
+
     def update_view(self):
         """Update the current view"""
+        if not self._schematic_visible:
+            return
+
+        # The topology only changes with the worker stopped, the state of the
+        # nodes and requests comes from the latest snapshot
+        simulation = self.sim_controls.current_simulation
+        network = simulation.network if simulation else None
         if self.current_view == "close":
-            CloseUpView.load(
+            self.close_up_view.load(
                 self.schematic_view,
-                self.sim_controls.current_simulation,
+                network,
+                self._network_state,
                 self.show_links,
                 self.is_dark_theme,
             )
         else:
             FarView.load(
                 self.schematic_view,
-                self.sim_controls.current_simulation,
+                network,
+                self._network_state,
                 self.is_dark_theme,
             )
 
     def toggle_links(self, state):
         """Toggle communication links"""
+        if bool(state) == self.show_links:
+            return
+
         self.show_links = bool(state)
         self.update_view()
 
@@ -318,80 +382,113 @@ class SimulationUI(QtWidgets.QMainWindow):
         dialog = EnlargedGraphDialog(chart_view, self)
         dialog.exec()
 
-    def on_simulation_step(self):
-        """Handle simulation step completion"""
-        if self.sim_controls.current_simulation:
-            self.sim_controls.current_simulation.steps_since_last_ui_update += 1
-
-    def on_new_simulation(self):
-        """Handle UI updates when a new simulation is created"""
-        if self.sim_controls.current_simulation is None:
+    def on_simulation_step(self, progress):
+        """Handle simulation step completion reported by the worker"""
+        # Snapshots still queued from a stopped worker are outdated
+        if not self._from_current_worker():
             return
 
-        self.node_stats_table.update_stats(
-            self.sim_controls.current_simulation.network.nodes,
-            self.handle_checkbox_change,
-        )
-        self.update_view()
-        self.total_energy_graph.clear()
-        self.node_energy_graph.clear()
+        self._pending_progress.append(progress)
+        self._view_dirty = True
+        if not self.ui_refresh_timer.isActive():
+            self.ui_refresh_timer.start()
 
-        # Reset graph indices for new simulation
-        self.last_total_energy_index = 0
-        self.node_energy_indices.clear()
+    def on_simulation_finished(self):
+        """Handle the worker reaching the end of the simulation"""
+        if self._from_current_worker():
+            self.sim_controls.on_simulation_finished()
 
-        # Plot initial data if available
-        if self.sim_controls.current_simulation.system_energy_history:
-            cumulative_energy = 0
-            for energy in self.sim_controls.current_simulation.system_energy_history:
-                cumulative_energy += energy
-                self.total_energy_graph.add_point(cumulative_energy)
-            self.last_total_energy_index = len(
-                self.sim_controls.current_simulation.system_energy_history
+    def on_simulation_paused(self):
+        """Show the state the simulation was paused at, the worker is stopped"""
+        self._pending_progress.append(
+            SimulationSnapshot.from_simulation(
+                self.sim_controls.current_simulation,
+                self.last_total_energy_index,
+                self._node_energy,
             )
+        )
+        self._view_dirty = True
+        if not self.ui_refresh_timer.isActive():
+            self.ui_refresh_timer.start()
+
+    def on_simulation_failed(self, error):
+        """Handle the worker failing to step the simulation"""
+        if self._from_current_worker():
+            self.sim_controls.on_simulation_failed(error)
+
+    def _from_current_worker(self):
+        """Whether the signal being handled was sent by the running worker"""
+        worker = self.sim_controls.worker
+        return worker is not None and self.sender() is worker
+
+    def _capture_network(self):
+        """Capture the network state of the current simulation for the views
+
+        Only called while no worker steps the simulation.
+        """
+        simulation = self.sim_controls.current_simulation
+        self._network_state = (
+            NetworkSnapshot.from_simulation(simulation) if simulation else None
+        )
+
+    def closeEvent(self, event):  # pylint: disable=invalid-name
+        """Stop the simulation worker before closing the window"""
+        self.sim_controls.stop_worker()
+        super().closeEvent(event)
+
+    def on_new_simulation(self):
+        """Handle UI updates when a new simulation is created"""
+        self.rebuild_from_simulation()
 
     def on_simulation_selected(self):
         """Handle UI updates when a simulation is selected"""
-        if self.sim_controls.current_simulation is None:
+        self.rebuild_from_simulation()
+
+    def rebuild_from_simulation(self):
+        """Rebuild the table, view and graphs from the current simulation
+
+        The simulation is not running, its whole state is captured at once.
+        """
+        self.latest_progress = None
+        self._pending_progress = []
+        self._node_energy = {}
+        self._network_state = None
+        simulation = self.sim_controls.current_simulation
+        if simulation is None:
             return
 
-        self.node_stats_table.update_stats(
-            self.sim_controls.current_simulation.network.nodes,
-            self.handle_checkbox_change,
-        )
-        self.update_view()
+        self.update_stats_rows()
 
         # Clear existing graphs
         self.total_energy_graph.clear()
         self.node_energy_graph.clear()
 
-        # Reset graph indices for selected simulation
+        # Reset graph indices for the simulation
         self.last_total_energy_index = 0
         self.node_energy_indices.clear()
 
-        # Plot existing data for total energy
-        if self.sim_controls.current_simulation.system_energy_history:
-            cumulative_energy = 0
-            for energy in self.sim_controls.current_simulation.system_energy_history:
-                cumulative_energy += energy
-                self.total_energy_graph.add_point(cumulative_energy)
-            self.last_total_energy_index = len(
-                self.sim_controls.current_simulation.system_energy_history
-            )
-
-        # Plot existing data for checked nodes
-        self.update_checked_nodes_graphs()
+        # Plot existing data for total energy and checked nodes
+        self._pending_progress.append(
+            SimulationSnapshot.from_simulation(simulation, previous_nodes={})
+        )
+        self.update_simulation_info()
+        self.update_view()
 
     def on_simulation_reset(self):
         """Handle UI updates when a simulation is reset"""
+        self.update_stats_rows()
+        self._capture_network()
         self.update_view()
         self.total_energy_graph.clear()
         self.node_energy_graph.clear()
-        self.current_time_label.setText("0.0s")
-        self.current_step_label.setText("0")
-        self.current_energy_label.setText("0.0 J")
-        self.simulation_rate_label.setText("0.0 steps/s")
+        self.show_text(self.current_time_label, "0.0s")
+        self.show_text(self.current_step_label, "0")
+        self.show_text(self.current_energy_label, "0.0 J")
+        self.show_text(self.simulation_rate_label, "0.0 steps/s")
         self.last_step_time = None
+        self.latest_progress = None
+        self._pending_progress = []
+        self._node_energy = {}
         self.rate_history.clear()  # Clear rate history on reset
 
         # Reset graph indices
@@ -400,11 +497,29 @@ class SimulationUI(QtWidgets.QMainWindow):
 
         # Reset request statistics
         for label in self.request_stats_labels.values():
-            label.setText("0")
+            self.show_text(label, "0")
 
     def on_nodes_updated(self):
         """Handle UI updates when nodes are added/removed"""
-        self.update_view()
+        self.update_stats_rows()
+        self._capture_network()
+        self._schedule_view_refresh()
+
+    def update_stats_rows(self):
+        """Rebuild the stats table rows for the nodes of the current simulation"""
+        if self.sim_controls.current_simulation is None:
+            return
+
+        self.node_stats_table.set_nodes(
+            self.sim_controls.current_simulation.network.nodes,
+            self.handle_checkbox_change,
+        )
+        self._checked_keys = self.node_stats_table.get_checked_nodes()
+
+    def _schedule_view_refresh(self):
+        """Redraw the view shortly, merging the requests made in the meantime"""
+        if not self.view_refresh_timer.isActive():
+            self.view_refresh_timer.start()
 
     def handle_checkbox_change(self, item):
         """Handle checkbox state changes in the stats table"""
@@ -417,87 +532,101 @@ class SimulationUI(QtWidgets.QMainWindow):
         row = item.row()
         node_item = self.node_stats_table.item(row, 1)
         if node_item:
-            node_text = node_item.text()
+            node_text = NodeStatsTable.node_key(node_item)
             if item.checkState() == QtCore.Qt.Checked:
-                # Add node to graph with all history
-                node = None
-                for n in self.sim_controls.current_simulation.network.nodes:
-                    if f"{type(n).__name__} {n.node_id}" == node_text:
-                        node = n
-                        break
-
-                if node and len(node.energy_history) > 0:
-                    self.node_energy_indices[node_text] = (
-                        0  # Reset index for new selection
-                    )
-                    for energy in node.energy_history:
-                        self.node_energy_graph.add_node_point(node_text, energy)
-                    self.node_energy_indices[node_text] = len(node.energy_history)
+                self._checked_keys.add(node_text)
+                # Add node to graph with the history sent in snapshots so far,
+                # recorded samples are never modified
+                network = self.sim_controls.current_simulation.network
+                node = network.node_by_key.get(node_text)
+                energy = self._node_energy.get(node_text)
+
+                if node and energy and energy.sample_count > 0:
+                    history = node.energy_history[: energy.sample_count]
+                    self.node_energy_graph.set_node_series(node_text, history)
+                    self.node_energy_indices[node_text] = energy.sample_count
             else:
+                self._checked_keys.discard(node_text)
                 # Remove node from graph and its index tracker
                 self.node_energy_graph.remove_node_series(node_text)
                 self.node_energy_indices.pop(node_text, None)
 
-    def update_checked_nodes_graphs(self):
-        """Update graphs for checked nodes"""
-        if self.sim_controls.current_simulation is None:
-            return
-
-        # Create a lookup dictionary for quick node access
-        node_lookup = {
-            f"{type(node).__name__} {node.node_id}": node
-            for node in self.sim_controls.current_simulation.network.nodes
-        }
-
-        # Process only checked rows
-        for row in range(self.node_stats_table.rowCount()):
-            checkbox_item = self.node_stats_table.item(row, 0)
-            if not (
-                checkbox_item
-                and checkbox_item.checkState() == QtCore.Qt.CheckState.Checked
-            ):
-                continue
-
-            node_item = self.node_stats_table.item(row, 1)
-            if not node_item:
-                continue
-
-            node_text = node_item.text()
-            if node := node_lookup.get(node_text):
-                # Initialize index tracker for new nodes
-                if node_text not in self.node_energy_indices:
-                    self.node_energy_indices[node_text] = 0
-
-                # Add only new points
-                start_idx = self.node_energy_indices[node_text]
-                new_points = node.energy_history[start_idx:]
-                for energy in new_points:
-                    self.node_energy_graph.add_node_point(node_text, energy)
+    @staticmethod
+    def _unplotted(samples, sample_count, plotted):
+        """Get the samples not plotted yet among the last ones of a history
+
+        Args:
+            samples: The last samples of a history of sample_count samples
+            plotted: Number of samples of the history already plotted
+        """
+        return samples[max(plotted - (sample_count - len(samples)), 0) :]
+
+    def update_checked_nodes_graphs(self, node_energy):
+        """Add the new energy samples of a node capture to the checked nodes"""
+        # Process only checked nodes, without walking the table rows
+        for node_text in self._checked_keys:
+            if energy := node_energy.get(node_text):
+                # Add only new points, snapshots may overlap what is plotted
+                plotted = self.node_energy_indices.get(node_text, 0)
+                self.node_energy_graph.add_node_points(
+                    node_text,
+                    self._unplotted(energy.new_samples, energy.sample_count, plotted),
+                )
 
                 # Update the last plotted index
-                self.node_energy_indices[node_text] = len(node.energy_history)
+                self.node_energy_indices[node_text] = max(plotted, energy.sample_count)
+
+    @staticmethod
+    def render_interval():
+        """Get the redraw interval in ms matching the screen refresh rate"""
+        screen = QtGui.QGuiApplication.primaryScreen()
+        refresh_rate = screen.refreshRate() if screen else 0
+        return int(1000 / (refresh_rate if refresh_rate > 0 else 60))
 
     def refresh_ui(self):
-        """Update UI elements at fixed rate"""
-        if (
-            self.sim_controls.current_simulation
-            and not self.sim_controls.current_simulation.is_paused
-        ):
-            self.update_view()
+        """Redraw the UI if the simulation stepped since the last frame"""
+        if not self._view_dirty:
+            # Idle until the next simulation step
+            self.ui_refresh_timer.stop()
+            return
+
+        # Frames slower than the refresh interval are spaced out so that the
+        # GUI thread stays idle at least half of the time
+        start = time.perf_counter()
+        if start - self._last_render < 2 * self._render_cost:
+            return
+
+        self._view_dirty = False
+        if self.sim_controls.current_simulation:
             self.update_simulation_info()
+            self.update_view()
+
+        self._last_render = start
+        self._render_cost += self.RENDER_COST_SMOOTHING * (
+            time.perf_counter() - start - self._render_cost
+        )
+
+    def show_text(self, label, text):
+        """Set the text of an info label, skipping the call if it is unchanged"""
+        if self._label_texts.get(label) != text:
+            self._label_texts[label] = text
+            label.setText(text)
 
     def update_simulation_info(self):
-        """Update simulation information displays"""
-        simulation = self.sim_controls.current_simulation
-        if simulation is None:
+        """Update simulation information displays from the pending snapshots"""
+        snapshots = self._pending_progress
+        if not snapshots:
             return
+        self._pending_progress = []
+        progress = snapshots[-1]
 
         # Calculate simulation rate with rolling average
         current_time_ns = QtCore.QDateTime.currentMSecsSinceEpoch() * 1_000_000
-        if self.last_step_time is not None:
+        if self.last_step_time is not None and self.latest_progress is not None:
             time_diff = (current_time_ns - self.last_step_time) / 1_000_000_000
             if time_diff > 0:
-                current_rate = simulation.steps_since_last_ui_update / time_diff
+                steps = progress.current_step - self.latest_progress.current_step
+                current_rate = steps / time_diff
 
                 # Add current rate to history
                 self.rate_history.append(current_rate)
@@ -508,44 +637,58 @@ class SimulationUI(QtWidgets.QMainWindow):
 
                 # Calculate average rate
                 avg_rate = sum(self.rate_history) / len(self.rate_history)
-                self.simulation_rate_label.setText(f"{avg_rate:.1f} steps/s")
+                self.show_text(self.simulation_rate_label, f"{avg_rate:.1f} steps/s")
         self.last_step_time = current_time_ns
-        simulation.steps_since_last_ui_update = 0
+        self.latest_progress = progress
 
-        # Update info displays
-        self.current_time_label.setText(f"{simulation.current_time:.1f}s")
-        self.current_step_label.setText(str(simulation.current_step))
-        self.current_energy_label.setText(f"{simulation.system_energy_consumed:.2f} J")
+        # Update info displays from the latest snapshot
+        self.show_text(self.current_time_label, f"{progress.current_time:.1f}s")
+        self.show_text(self.current_step_label, str(progress.current_step))
+        self.show_text(
+            self.current_energy_label, f"{progress.system_energy_consumed:.2f} J"
+        )
 
-        # Add only new points to total energy graph
-        if len(simulation.system_energy_history) > self.last_total_energy_index:
-            cumulative_energy = sum(
-                simulation.system_energy_history[: self.last_total_energy_index]
+        for snapshot in snapshots:
+            # Add only new points to total energy graph
+            self.total_energy_graph.add_cumulative_points(
+                self._unplotted(
+                    snapshot.new_energy_samples,
+                    snapshot.energy_sample_count,
+                    self.last_total_energy_index,
+                )
             )
-            new_points = simulation.system_energy_history[
-                self.last_total_energy_index :
-            ]
+            self.last_total_energy_index = max(
+                self.last_total_energy_index, snapshot.energy_sample_count
+            )
+
+            # Nodes and network are only captured in some of the snapshots
+            if snapshot.nodes is not None:
+                self._node_energy = snapshot.nodes
+                self._network_state = snapshot.network
+                self.update_checked_nodes_graphs(snapshot.nodes)
 
-            for energy in new_points:
-                cumulative_energy += energy
-                self.total_energy_graph.add_point(cumulative_energy)
+        # Update stats of the latest node capture
+        self.node_stats_table.refresh_values(self._node_energy)
 
-            self.last_total_energy_index = len(simulation.system_energy_history)
+        # Update request statistics
+        for status, count in progress.request_state_stats.items():
+            self.show_text(self.request_stats_labels[status], str(count))
 
-        # Update stats and node energy graphs
-        self.node_stats_table.update_stats(
-            simulation.network.nodes, self.handle_checkbox_change
+
+def main():
+    """Launch the simulation GUI"""
+    # Task bar Icon on Windows
+    if platform.system() == "Windows":
+        ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(
+            "optimisation_ntn"
         )
-        self.update_checked_nodes_graphs()
 
-        # Update request statistics
-        if hasattr(simulation, "request_state_stats"):
-            for status, count in simulation.request_state_stats.items():
-                self.request_stats_labels[status].setText(str(count))
+    app = QtWidgets.QApplication(sys.argv)
+    app.setWindowIcon(QtGui.QIcon("images/logo.png"))  # Taskbar icon
+    window = SimulationUI()
+    window.show()
+    sys.exit(app.exec())
 
 
-app = QtWidgets.QApplication(sys.argv)
-app.setWindowIcon(QtGui.QIcon("images/logo.png"))  # Taskbar icon
-window = SimulationUI()
-window.show()
-sys.exit(app.exec())
+if __name__ == "__main__":
+    main()
@@ -1,25 +1,22 @@
 """ Main module, runs the simulation or optimization """
 
 import argparse
+import functools
+import multiprocessing
+import os
 from typing import List, Tuple
 
 import numpy as np
-from pymoo.algorithms.soo.nonconvex.de import DE
-from pymoo.algorithms.soo.nonconvex.ga import GA
-from pymoo.algorithms.soo.nonconvex.pso import PSO
-from pymoo.operators.crossover.sbx import SBX
-from pymoo.operators.mutation.pm import PM
-from pymoo.operators.repair.rounding import RoundingRepair
-from pymoo.operators.sampling.rnd import IntegerRandomSampling
-from pymoo.optimize import minimize
 
 from optimisation_ntn.algorithms.assignment.strategy_factory import (
     AssignmentStrategyFactory,
 )
-from optimisation_ntn.optimization.optimization_problem import OptimizationProblem
 from optimisation_ntn.simulation import Simulation, SimulationConfig
 from optimisation_ntn.algorithms.power.strategy_factory import PowerStrategyFactory
 
+OPTIMIZERS = AssignmentStrategyFactory.optimization_strategies()
+CONVERGENCE_PERIOD = 5  # Generations without improvement before stopping
+
 
 def create_argument_parser():
     """Create parser for command line arguments"""
@@ -62,16 +59,12 @@ def create_argument_parser():
         help="Power management strategy to use",
     )
 
-    # Combined assignment strategy and optimization algorithm choice
-    all_strategies = AssignmentStrategyFactory.available_strategies() + [
-        "GA",
-        "DE",
-        "PSO",
-    ]
+    # Combined assignment strategy and optimization algorithm choice, the
+    # factory already lists the optimization algorithms
     arg_parser.add_argument(
         "--strategy",
         type=str,
-        choices=all_strategies,
+        choices=AssignmentStrategyFactory.available_strategies(),
         default="TimeGreedy",
         help="Assignment strategy or optimization algorithm to use",
     )
@@ -81,7 +74,9 @@ def create_argument_parser():
         "--generations",
         type=int,
         default=5,
-        help="Number of generations for optimization algorithms",
+        help="Maximum number of generations for optimization algorithms, runs "
+        f"longer than {CONVERGENCE_PERIOD} generations stop early once the best "
+        f"solution stalls for {CONVERGENCE_PERIOD} generations",
     )
 
     arg_parser.add_argument(
@@ -91,6 +86,14 @@ def create_argument_parser():
         help="Population size for optimization algorithms",
     )
 
+    arg_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Processes evaluating the population of optimization algorithms, "
+        "0 for one per CPU",
+    )
+
     arg_parser.add_argument(
         "--hide_output",
         action="store_true",
@@ -115,8 +118,12 @@ def create_argument_parser():
 
 
 def run_optimization(
-    simulation: Simulation, algorithm_name: str, n_generations: int, pop_size: int
-) -> Tuple[List[int], float, float]:
+    simulation: Simulation,
+    algorithm_name: str,
+    n_generations: int,
+    pop_size: int,
+    workers: int = 1,
+) -> Tuple[List[int], float, float, Tuple[float, float]]:
     """Run optimization with specified algorithm.
 
     Args:
@@ -124,19 +131,65 @@ def run_optimization(
         algorithm_name: Name of algorithm to use
         n_generations: Number of generations to run
         pop_size: Population size
+        workers: Processes evaluating the population, 0 for one per CPU
 
     Returns:
-        Tuple of (best assignment vector, energy consumed, satisfaction rate)
+        Tuple of (best assignment vector, energy consumed, satisfaction rate,
+        mean energy and satisfaction rate of the random initial population)
     """
-    # Count compute nodes
-    n_nodes = (
-        len(simulation.network.base_stations)
-        + len(simulation.network.haps_nodes)
-        + len(simulation.network.leo_nodes)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        return _run_optimization(simulation, algorithm_name, n_generations, pop_size)
+
+    from optimisation_ntn.optimization.optimization_problem import (
+        init_worker,
+        simulate_in_worker,
     )
 
+    # Every worker receives its own copy of the simulation once, then only
+    # the assignment vectors to evaluate
+    with multiprocessing.Pool(
+        workers, initializer=init_worker, initargs=(simulation,)
+    ) as pool:
+        return _run_optimization(
+            simulation,
+            algorithm_name,
+            n_generations,
+            pop_size,
+            map_vectors=functools.partial(pool.map, simulate_in_worker),
+        )
+
+
+def _run_optimization(
+    simulation: Simulation,
+    algorithm_name: str,
+    n_generations: int,
+    pop_size: int,
+    **problem_kwargs,
+) -> Tuple[List[int], float, float, Tuple[float, float]]:
+    """Run optimization with specified algorithm, see run_optimization"""
+    # pymoo is only imported once an optimization actually runs
+    from pymoo.algorithms.soo.nonconvex.de import DE
+    from pymoo.algorithms.soo.nonconvex.ga import GA
+    from pymoo.algorithms.soo.nonconvex.pso import PSO
+    from pymoo.operators.crossover.sbx import SBX
+    from pymoo.operators.mutation.pm import PM
+    from pymoo.operators.repair.rounding import RoundingRepair
+    from pymoo.operators.sampling.rnd import IntegerRandomSampling
+    from pymoo.optimize import minimize
+    from pymoo.termination.default import DefaultSingleObjectiveTermination
+
+    from optimisation_ntn.optimization.optimization_problem import (
+        OptimizationProblem,
+    )
+
+    # Count compute nodes
+    n_nodes = len(simulation.network.compute_nodes)
+
     # Create optimization problem
-    problem = OptimizationProblem(simulation, simulation.user_count, n_nodes)
+    problem = OptimizationProblem(
+        simulation, simulation.user_count, n_nodes, **problem_kwargs
+    )
 
     # Configure algorithm
     if algorithm_name == "GA":
@@ -169,21 +222,32 @@ def run_optimization(
 
     # Run optimization
     print(f"\nRunning optimization with {algorithm_name}...")
-    result = minimize(
-        problem, algorithm, ("n_gen", n_generations), seed=42, verbose=True
+    # Stop early once the best solution stalls for CONVERGENCE_PERIOD generations
+    termination = DefaultSingleObjectiveTermination(
+        xtol=1e-6,
+        ftol=1e-4,
+        period=CONVERGENCE_PERIOD,
+        n_max_gen=n_generations,
+        n_max_evals=None,
     )
+    result = minimize(problem, algorithm, termination, seed=42, verbose=True)
+
+    # The first population is drawn at random, it doubles as the baseline
+    energy_mean, satisfaction_mean = problem.initial_fitness.mean(axis=0)
+    baseline = (float(energy_mean), float(satisfaction_mean))
 
     if result.X is not None:
-        best_x = result.X.astype(int)
+        # Round rather than truncate, in case the algorithm returns floats
+        best_x = np.rint(result.X).astype(int)
         energy, satisfaction = simulation.run_with_assignment(best_x)
         print(f"\nBest solution found by {algorithm_name}:")
         print(f"Assignment vector: {best_x}")
         print(f"Energy consumed: {energy:.2f} J")
         print(f"QoS satisfaction: {satisfaction * 100:.2f}%")
-        return best_x, energy, satisfaction
+        return best_x, energy, satisfaction, baseline
 
     print(f"\n{algorithm_name} found no feasible solution")
-    return [], 0.0, 0.0
+    return [], 0.0, 0.0, baseline
 
 
 def main(cli_args):
@@ -199,9 +263,7 @@ def main(cli_args):
         assignment_strategy=cli_args.strategy,
         power_strategy=cli_args.power,
         save_results=not cli_args.no_save,
-        optimizer=(
-            cli_args.strategy if cli_args.strategy in ["GA", "DE", "PSO"] else None
-        ),
+        optimizer=(cli_args.strategy if cli_args.strategy in OPTIMIZERS else None),
         qtable_path=cli_args.qtable_path,
     )
 
@@ -209,18 +271,17 @@ def main(cli_args):
     simulation = Simulation(config)
 
     # Check if using an optimization algorithm
-    if cli_args.strategy in ["GA", "DE", "PSO"]:
-        baseline_energy, baseline_satisfaction = simulation.run_with_assignment(
-            np.random.randint(
-                0, len(simulation.network.compute_nodes) - 1, simulation.user_count
-            )
-        )
-
-        best_vector, energy, satisfaction = run_optimization(
-            simulation, cli_args.strategy, cli_args.generations, cli_args.population
+    if cli_args.strategy in OPTIMIZERS:
+        best_vector, energy, satisfaction, baseline = run_optimization(
+            simulation,
+            cli_args.strategy,
+            cli_args.generations,
+            cli_args.population,
+            cli_args.workers,
         )
 
-        # Compare with baseline
+        # Compare with the random assignments of the initial population
+        baseline_energy, baseline_satisfaction = baseline
         if not cli_args.hide_output:
             print("\nComparing with Random strategy...")
             print("\nResults comparison:")
@@ -238,7 +299,10 @@ def main(cli_args):
     return simulation.run()
 
 
+def entrypoint():
+    """Run the simulation from the command line arguments"""
+    return main(create_argument_parser().parse_args())
+
+
 if __name__ == "__main__":
-    parser = create_argument_parser()
-    args = parser.parse_args()
-    main(args)
+    entrypoint()
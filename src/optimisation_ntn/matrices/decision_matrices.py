@@ -1,7 +1,7 @@
 """ Decision matrices class """
 
 from enum import Enum
-from typing import Dict
+from typing import Dict, Optional
 
 import numpy as np
 
@@ -23,14 +23,37 @@ class MatrixType(Enum):
 class DecisionMatrices:
     """Decision matrices class"""
 
+    MATRIX_DTYPE = np.uint8  # Every decision matrix only holds 0 and 1
+    COVERAGE_TILE_SIZE = 256  # Users whose coverage is computed at once
+
     def __init__(self, dimension: int = 0):
         """Initialize matrices used in network decision processes."""
         self.matrices: Dict[MatrixType, np.ndarray] = {
-            MatrixType.COVERAGE_ZONE: np.zeros((dimension, dimension)),
-            MatrixType.POWER_STATE: np.zeros((dimension, dimension)),
-            MatrixType.REQUEST: np.zeros((dimension, dimension)),
-            MatrixType.ASSIGNMENT: np.zeros((dimension, dimension)),
+            matrix_type: np.zeros((dimension, dimension), dtype=self.MATRIX_DTYPE)
+            for matrix_type in MatrixType
         }
+        # Requests as (tick, user) pairs sorted by tick, to find a tick's
+        # users without scanning a column of the request matrix
+        self._request_ticks = np.empty(0, dtype=np.intp)
+        self._request_users = np.empty(0, dtype=np.intp)
+        # Matrices allocated here, those given to set_matrix are never refilled
+        self._owned = set(MatrixType)
+
+    def _cleared_matrix(self, matrix_type: MatrixType, shape) -> np.ndarray:
+        """Get a zeroed matrix of a shape, reusing the current buffer if it fits.
+
+        Matrices allocated here are regenerated in place, arrays returned by
+        get_matrix before are overwritten.
+        """
+        matrix = self.matrices[matrix_type]
+        if (
+            matrix_type in self._owned
+            and matrix.shape == shape
+            and matrix.dtype == self.MATRIX_DTYPE
+        ):
+            matrix.fill(0)
+            return matrix
+        return np.zeros(shape, dtype=self.MATRIX_DTYPE)
 
     def generate_coverage_matrix(self, network, coverage_radius: float = 5000):
         """Pre-compute coverage zones for base stations.
@@ -40,81 +63,110 @@ class DecisionMatrices:
             network: Network containing users and base stations
             coverage_radius: Maximum coverage radius to consider for all base stations
         """
-        users = [n for n in network.nodes if isinstance(n, UserDevice)]
-        base_stations = [n for n in network.nodes if isinstance(n, BaseStation)]
-
-        coverage_matrix = np.zeros((len(users), len(base_stations)))
-
-        for i, user in enumerate(users):
-            # Calculate distances to all base stations
-            distances = [user.position.distance_to(bs.position) for bs in base_stations]
-            in_range_indices = [
-                j for j, dist in enumerate(distances) if dist <= coverage_radius
-            ]
-
-            if in_range_indices:  # If there are base stations in range
-                # Find the closest base station(s)
-                min_distance = min(distances[j] for j in in_range_indices)
-                # Mark only the closest base station(s)
-                for j in in_range_indices:
-                    if distances[j] == min_distance:
-                        coverage_matrix[i, j] = 1
+        user_coords = network.node_positions(UserDevice)
+        bs_coords = network.node_positions(BaseStation)
+        coverage_matrix = self._cleared_matrix(
+            MatrixType.COVERAGE_ZONE, (len(user_coords), len(bs_coords))
+        )
+
+        # |u - b|^2 = |u|^2 + |b|^2 - 2 u.b, a matrix product instead of
+        # a (users, base stations, 2) array of differences
+        user_norms = np.einsum("ij,ij->i", user_coords, user_coords)
+        bs_norms = np.einsum("ij,ij->i", bs_coords, bs_coords)
+
+        # Users are handled in tiles to bound the size of the temporaries
+        for start in range(0, len(user_coords), self.COVERAGE_TILE_SIZE):
+            tile = slice(start, start + self.COVERAGE_TILE_SIZE)
+            # Squared distance of every (user, base station) pair, without sqrt
+            squared_distances = user_norms[tile, np.newaxis] + bs_norms
+            squared_distances -= 2.0 * (user_coords[tile] @ bs_coords.T)
+            # Rounding can leave tiny negative values for coinciding positions
+            np.maximum(squared_distances, 0.0, out=squared_distances)
+            in_range = squared_distances <= coverage_radius**2
+            min_distances = np.min(
+                np.where(in_range, squared_distances, np.inf),
+                axis=1,
+                keepdims=True,
+                initial=np.inf,
+            )
+            # Mark only the closest base station(s) in range of each user
+            coverage_matrix[tile] = in_range & (squared_distances == min_distances)
 
         self.matrices[MatrixType.COVERAGE_ZONE] = coverage_matrix
+        self._owned.add(MatrixType.COVERAGE_ZONE)
 
     def generate_request_matrix(
-        self, num_requests: int, num_steps: int, time=0.1, time_buffer=None
+        self,
+        num_requests: int,
+        num_steps: int,
+        time=0.1,
+        time_buffer=None,
+        rng: Optional[np.random.Generator] = None,
     ):
-        """Generate request matrix where each user generates exactly one request."""
-        np.random.seed(42)
+        """Generate request matrix where each user generates exactly one request.
+
+        Args:
+            rng: Generator drawing the request times, seeded with 42 if not given
+        """
+        if rng is None:
+            rng = np.random.default_rng(42)
         if num_requests <= 0 or num_steps <= 0:
             raise ValueError("Number of requests and steps must be positive")
 
-        if time_buffer is None:
-            request_matrix = np.zeros((num_requests, num_steps))
-        else:
-            num_steps = num_steps - int(time_buffer / time)
-            request_matrix = np.zeros((num_requests, num_steps))
-
-        # Generate Poisson distribution of requests
-        count = 0
-        while True:
-            ps = np.random.poisson(num_requests / num_steps, num_steps)
-            count += 1
-            if np.sum(ps) == num_requests or count > 1000:  # Add timeout
-                row_index = 0
-                for tick, count in enumerate(ps):
-                    for _ in range(count):
-                        if row_index < num_requests:
-                            request_matrix[row_index, tick] = 1
-                            row_index += 1
-                self.matrices[MatrixType.REQUEST] = request_matrix
-                break
-
-        # Add padding to the request matrix if time_buffer is provided (padding with 0s)
+        # The columns of the time buffer are allocated with the matrix and
+        # left empty, instead of padding a copy of the matrix afterwards
+        request_matrix = self._cleared_matrix(
+            MatrixType.REQUEST, (num_requests, num_steps)
+        )
         if time_buffer is not None:
-            self.matrices[MatrixType.REQUEST] = np.pad(
-                request_matrix, (0, int(time_buffer / time)), mode="constant"
-            )
+            num_steps = num_steps - int(time_buffer / time)
+
+        # Generate Poisson distribution of requests, then add or remove
+        # random requests so that every user makes exactly one
+        ps = rng.poisson(num_requests / num_steps, num_steps)
+        delta = num_requests - np.sum(ps)
+        if delta > 0:
+            np.add.at(ps, rng.integers(0, num_steps, delta), 1)
+        elif delta < 0:
+            drawn_ticks = np.repeat(np.arange(num_steps), ps)
+            dropped = rng.choice(len(drawn_ticks), -delta, replace=False)
+            np.subtract.at(ps, drawn_ticks[dropped], 1)
+
+        # Tick of each request in row order
+        ticks = np.repeat(np.arange(num_steps), ps)
+        users = np.arange(num_requests)
+        request_matrix[users, ticks] = 1
+        self.matrices[MatrixType.REQUEST] = request_matrix
+        self._owned.add(MatrixType.REQUEST)
+        self._request_ticks = ticks
+        self._request_users = users
 
     def update_assignment_matrix(self, network: Network):
-        """Update real-time request assignment matrix"""
-        users = [n for n in network.nodes if isinstance(n, UserDevice)]
+        """Update real-time request assignment matrix.
+
+        Take a snapshot to keep the assignments of a tick, the matrix is
+        refilled in place.
+        """
+        users = network.user_nodes
         compute_nodes = network.get_compute_nodes(check_state=False)
 
-        assignment_matrix = np.zeros((len(users), len(compute_nodes)))
+        node_index = {node: j for j, node in enumerate(compute_nodes)}
+
+        assignment_matrix = self._cleared_matrix(
+            MatrixType.ASSIGNMENT, (len(users), len(compute_nodes))
+        )
 
         # Check each user's active requests
         for i, user in enumerate(users):
             for request in user.current_requests:
                 if request.status == RequestStatus.PROCESSING:
                     # Find index of compute node processing this request
-                    for j, node in enumerate(compute_nodes):
-                        if node == request.current_node:
-                            assignment_matrix[i, j] = 1
-                            break
+                    j = node_index.get(request.current_node)
+                    if j is not None:
+                        assignment_matrix[i, j] = 1
 
         self.matrices[MatrixType.ASSIGNMENT] = assignment_matrix
+        self._owned.add(MatrixType.ASSIGNMENT)
 
     def get_matrix(self, name: MatrixType) -> np.ndarray:
         """Get matrix by enum value.
@@ -145,9 +197,30 @@ class DecisionMatrices:
         """
         matrix_type = name if isinstance(name, MatrixType) else MatrixType(name)
         self.matrices[matrix_type] = matrix
+        self._owned.discard(matrix_type)
+        if matrix_type is MatrixType.REQUEST:
+            self._request_ticks, self._request_users = np.nonzero(matrix.T)
+
+    def requesting_users(self, step: int) -> np.ndarray:
+        """Get the indices of the users making a request at a step"""
+        start, stop = np.searchsorted(self._request_ticks, [step, step + 1])
+        return self._request_users[start:stop]
 
     def get_snapshot(self) -> Dict[MatrixType, np.ndarray]:
-        """Create a snapshot of current matrices state"""
-        return {
-            matrix_type: matrix.copy() for matrix_type, matrix in self.matrices.items()
-        }
+        """Create a snapshot of current matrices state.
+
+        The matrices are copied into a single buffer, the snapshot holds views
+        of it and stays unchanged when the matrices are updated.
+        """
+        buffer = np.empty(
+            sum(matrix.size for matrix in self.matrices.values()),
+            dtype=np.result_type(*self.matrices.values()),
+        )
+        snapshot = {}
+        offset = 0
+        for matrix_type, matrix in self.matrices.items():
+            view = buffer[offset : offset + matrix.size].reshape(matrix.shape)
+            np.copyto(view, matrix)
+            snapshot[matrix_type] = view
+            offset += matrix.size
+        return snapshot
@@ -2,6 +2,8 @@
 
 from typing import List
 
+import numpy as np
+
 from optimisation_ntn.networks.request import Request
 from optimisation_ntn.nodes.base_node import BaseNode
 
@@ -24,12 +26,24 @@ class Network:
         self.haps_nodes: List[HAPS] = []
         self.base_stations: List[BaseStation] = []
         self.leo_nodes: List[LEO] = []
+        self._compute_nodes: List[BaseNode] = []  # HAPS, base stations then LEO
         self.power_strategy = PowerStrategyFactory.get_strategy(power_strategy)
+        self._nodes_by_type = {
+            UserDevice: self.user_nodes,
+            HAPS: self.haps_nodes,
+            BaseStation: self.base_stations,
+            LEO: self.leo_nodes,
+        }
+        self._positions = {}  # Cached coordinates of fixed nodes per type
+        self._link_endpoints = None  # Cached node indices of every link
+        self.version = 0  # Incremented whenever nodes are added or removed
+        self.node_by_key = {}  # Every node, keyed by its display_key
+        self.link_by_endpoints = {}  # Every link, keyed by (node_a, node_b)
 
     @property
     def compute_nodes(self):
-        """Get all compute nodes"""
-        return self.haps_nodes + self.base_stations + self.leo_nodes
+        """Get all compute nodes, the list is rebuilt when the topology changes"""
+        return self._compute_nodes
 
     def debug_print(self, *args, **kwargs):
         """Print only if debug mode is enabled"""
@@ -50,6 +64,8 @@ class Network:
 
     def count_nodes_by_type(self, node_type: type) -> int:
         """Count nodes of a specific type in network."""
+        if node_type in self._nodes_by_type:
+            return len(self._nodes_by_type[node_type])
         return len([n for n in self.nodes if isinstance(n, node_type)])
 
     def add_node(self, node):
@@ -57,16 +73,83 @@ class Network:
         self.nodes.append(node)
         self._update_communication_links()
 
+    def add_nodes(self, nodes: List[BaseNode]):
+        """Add several nodes to the network, rebuilding the links once"""
+        self.nodes.extend(nodes)
+        self._update_communication_links()
+
+    def remove_nodes(self, node_type: type):
+        """Remove every node of a specific type from the network"""
+        self.nodes = [node for node in self.nodes if not isinstance(node, node_type)]
+        self._update_communication_links()
+
+    def nodes_of_type(self, node_type: type) -> List[BaseNode]:
+        """Get the nodes of a specific type, in insertion order"""
+        return self._nodes_by_type.get(node_type, [])
+
+    def node_positions(self, node_type: type) -> np.ndarray:
+        """Get the (x, y) coordinates of the nodes of a type, in insertion order.
+
+        LEO satellites move, so only the positions of the other node types
+        are cached until the topology changes.
+        """
+        positions = self._positions.get(node_type)
+        if positions is None:
+            positions = np.array(
+                [node.position.coords for node in self.nodes_of_type(node_type)],
+                dtype=float,
+            ).reshape(-1, 2)
+            if node_type is not LEO:
+                self._positions[node_type] = positions
+        return positions
+
+    def node_positions_x(self, node_type: type) -> np.ndarray:
+        """Get the x coordinates of the nodes of a type, in insertion order"""
+        return self.node_positions(node_type)[:, 0]
+
+    def leo_angles(self) -> np.ndarray:
+        """Get the current orbital angle of every LEO satellite, in degrees"""
+        return np.fromiter(
+            (leo.current_angle for leo in self.leo_nodes),
+            dtype=float,
+            count=len(self.leo_nodes),
+        )
+
+    def link_endpoints(self) -> np.ndarray:
+        """Get the indices in self.nodes of the two ends of every link.
+
+        The (links, 2) table is built once per topology change.
+        """
+        if self._link_endpoints is None:
+            node_index = {node: i for i, node in enumerate(self.nodes)}
+            self._link_endpoints = np.array(
+                [
+                    (node_index[link.node_a], node_index[link.node_b])
+                    for link in self.communication_links
+                ],
+                dtype=np.intp,
+            ).reshape(-1, 2)
+        return self._link_endpoints
+
     def _update_communication_links(self):
         """Update all communication links in the network"""
         self.communication_links.clear()
-        # Get nodes by type
-        self.haps_nodes = [node for node in self.nodes if isinstance(node, HAPS)]
-        self.user_nodes = [node for node in self.nodes if isinstance(node, UserDevice)]
-        self.base_stations = [
-            node for node in self.nodes if isinstance(node, BaseStation)
-        ]
-        self.leo_nodes = [node for node in self.nodes if isinstance(node, LEO)]
+        self._positions.clear()
+        self._link_endpoints = None
+        self.version += 1
+        # Partition and index the nodes in a single pass
+        self._nodes_by_type = {node_type: [] for node_type in self._nodes_by_type}
+        self.node_by_key = {}
+        for node in self.nodes:
+            self.node_by_key[node.display_key] = node
+            nodes = self._nodes_by_type.get(type(node))
+            if nodes is not None:
+                nodes.append(node)
+        self.user_nodes = self._nodes_by_type[UserDevice]
+        self.haps_nodes = self._nodes_by_type[HAPS]
+        self.base_stations = self._nodes_by_type[BaseStation]
+        self.leo_nodes = self._nodes_by_type[LEO]
+        self._compute_nodes = self.haps_nodes + self.base_stations + self.leo_nodes
 
         self.debug_print("\nCreating communication links:")
 
@@ -166,6 +249,11 @@ class Network:
                 self.communication_links.append(link)
                 self.debug_print(f"Created link: {haps} -> {leo}")
 
+        # Requests are routed by looking up the link towards their next node
+        self.link_by_endpoints = {}
+        for link in self.communication_links:
+            self.link_by_endpoints.setdefault((link.node_a, link.node_b), link)
+
     def get_compute_nodes(
         self, request: Request | None = None, check_state: bool = True
     ) -> List[BaseNode]:
@@ -183,7 +271,7 @@ class Network:
         closest_haps = None
         min_distance = float("inf")
         for haps in self.haps_nodes:
-            distance = source.position.distance_to(haps.position)
+            distance = source.position.distance_squared_to(haps.position)
             if distance < min_distance:
                 min_distance = distance
                 closest_haps = haps
@@ -219,8 +307,12 @@ class Network:
         for node in self.nodes:
             node.tick(time)
 
-        # Update all communication links
+        # Update the communication links, idle links have nothing to do
+        completed_links = []
         for link in self.communication_links:
+            if not (link.transmission_queue or link.completed_requests):
+                continue
+
             if link.transmission_queue:
                 self.debug_print(
                     f"Link {link.node_a} -> {link.node_b} has "
@@ -233,9 +325,11 @@ class Network:
                 )
 
             link.tick(time)
+            if link.completed_requests:
+                completed_links.append(link)
 
         # Handle completed transmissions at the end of the tick
-        for link in self.communication_links:
+        for link in completed_links:
             for request in link.completed_requests:
                 current_node = request.path[request.path_index]
                 request.path_index += 1
@@ -257,14 +351,10 @@ class Network:
                     )
 
                     # Find next link and add request to its queue
-                    for next_link in self.communication_links:
-                        if (
-                            next_link.node_a == current_node
-                            and next_link.node_b == next_node
-                        ):
-                            next_link.add_to_queue(request)
-                            request.next_node = next_node
-                            break
+                    next_link = self.link_by_endpoints.get((current_node, next_node))
+                    if next_link is not None:
+                        next_link.add_to_queue(request)
+                        request.next_node = next_node
 
     def get_total_energy_consumed(self):
         """Get total energy consumed by all nodes"""
@@ -3,6 +3,8 @@
 from abc import ABC
 from typing import Dict, List, Optional, Tuple
 
+import numpy as np
+
 from ..networks.antenna import Antenna
 from ..networks.request import Request, RequestStatus
 from ..utils.conversion import convert_dbm_watt
@@ -13,6 +15,8 @@ from ..utils.position import Position
 class BaseNode(ABC):
     """Base node class"""
 
+    ENERGY_HISTORY_CAPACITY = 1024  # Initial number of ticks of energy history
+
     def __init__(
         self,
         node_id: int,
@@ -20,6 +24,8 @@ class BaseNode(ABC):
         debug: bool = False,
     ):
         self.node_id = node_id
+        # Name identifying the node within a network, like HAPS 0
+        self.display_key = f"{type(self).__name__} {node_id}"
         self.position = initial_position
         self.state = False
         self.antennas: List[Antenna] = []
@@ -46,11 +52,29 @@ class BaseNode(ABC):
         self.attenuation_coefficient = 0.0
         self.destinations: List["BaseNode"] = []
         self.last_tick_energy = 0.0
-        self.energy_history = []
+        self.tick_energy = 0.0  # J consumed during the last tick
+        # Energy consumed at every tick, grown by doubling, see energy_history
+        self._energy_samples = np.empty(self.ENERGY_HISTORY_CAPACITY, dtype=np.float32)
+        self.energy_samples_count = 0
         self.timeout = 10
         self.last_state_change = 0
         self.tick_count = 0
 
+    @property
+    def energy_history(self) -> np.ndarray:
+        """Energy consumed at every tick so far, a float32 view without copy"""
+        return self._energy_samples[: self.energy_samples_count]
+
+    def _record_tick_energy(self, energy: float):
+        """Append the energy consumed during a tick to the energy history"""
+        if self.energy_samples_count == len(self._energy_samples):
+            samples = np.empty(2 * len(self._energy_samples), dtype=np.float32)
+            samples[: self.energy_samples_count] = self._energy_samples
+            # Views handed out before stay valid on the previous array
+            self._energy_samples = samples
+        self._energy_samples[self.energy_samples_count] = energy
+        self.energy_samples_count += 1
+
     def get_name(self) -> str:
         """Get node name"""
         return self.name
@@ -237,10 +261,10 @@ class BaseNode(ABC):
             self.energy_consumed += self.idle_energy * time
 
         # Store energy consumed during this time step
-        energy_this_tick = self.energy_consumed - self.last_tick_energy
+        self.tick_energy = self.energy_consumed - self.last_tick_energy
         self.last_tick_energy = self.energy_consumed
 
-        self.energy_history.append(energy_this_tick)
+        self._record_tick_energy(self.tick_energy)
         self.last_state_change += time
 
     def debug_print(self, *args, **kwargs):
@@ -1,18 +1,38 @@
 """ Optimization problem class """
 
-from pymoo.core.problem import ElementwiseProblem
+from collections import OrderedDict
 
+import numpy as np
+from pymoo.core.problem import Problem
 
-class OptimizationProblem(ElementwiseProblem):
+_worker_simulation = None  # pylint: disable=invalid-name
+
+
+def init_worker(simulation):
+    """Keep the simulation of a worker process, sent once when it starts"""
+    global _worker_simulation  # pylint: disable=global-statement
+    _worker_simulation = simulation
+
+
+def simulate_in_worker(assignment_vector):
+    """Get the (energy, satisfaction) of an assignment vector in a worker"""
+    return _worker_simulation.run_with_assignment(assignment_vector)
+
+
+class OptimizationProblem(Problem):
     """Problem definition for pymoo optimization"""
 
-    def __init__(self, simulation, n_requests: int, n_nodes: int):
+    FITNESS_CACHE_SIZE = 10_000  # Evaluated assignment vectors kept in memory
+
+    def __init__(self, simulation, n_requests: int, n_nodes: int, map_vectors=None):
         """Initialize the optimization problem.
 
         Args:
             simulation: Simulation instance
             n_requests: Number of requests to optimize
             n_nodes: Number of compute nodes available
+            map_vectors: Simulates a list of assignment vectors, e.g. Pool.map
+                over simulate_in_worker, one after another by default
         """
         super().__init__(
             n_var=n_requests,  # Number of variables (assignments)
@@ -25,23 +45,66 @@ class OptimizationProblem(ElementwiseProblem):
         self.simulation = simulation
         self.n_requests = n_requests
         self.n_nodes = n_nodes
+        # Smallest integer type holding every node index, uint8 in practice
+        self.vector_dtype = np.min_scalar_type(max(n_nodes - 1, 0))
+        self.map_vectors = map_vectors or self._simulate_serially
+        # (energy, satisfaction) of assignment vectors, least recently used first
+        self._fitness_cache = OrderedDict()
+        # (energy, satisfaction) rows of the first population, randomly sampled
+        self.initial_fitness = None
 
     def _evaluate(self, x, out, *args, **kwargs):
-        """Evaluate a solution vector.
+        """Evaluate a population of solution vectors.
 
         Args:
-            x: Solution vector (assignment vector)
+            x: Solution vectors (assignment vectors), one per row
             out: Output dictionary for objectives and constraints
 
         Returns:
             None (updates out dictionary)
         """
-        # Run simulation with this assignment vector
-        self.simulation.reset()
-        energy, satisfaction = self.simulation.run_with_assignment(x)
+        fitness = self._fitness(x)
+        if self.initial_fitness is None:
+            self.initial_fitness = fitness
+        energy, satisfaction = fitness.T
 
         # Set objective (energy consumption)
-        out["F"] = [energy * ((5 - satisfaction) / 5)]  # bonus of 20% for satisfaction
+        out["F"] = energy * ((5 - satisfaction) / 5)  # bonus of 20% for satisfaction
 
         # Set constraint (QoS satisfaction must be >= 90%)
-        out["G"] = [0.90 - satisfaction]
+        out["G"] = 0.90 - satisfaction
+
+    def _fitness(self, x):
+        """Simulate the rows of x, once per distinct row not simulated before
+
+        The simulation is reset before each run, with a seed the same vector
+        always gives the same result.
+
+        Returns:
+            Array of (energy, satisfaction) rows
+        """
+        # Compact vectors make smaller cache keys and messages to the workers
+        x = np.asarray(x).astype(self.vector_dtype, copy=False)
+        keys = [row.tobytes() for row in x]
+
+        # Duplicates within the population are only simulated once
+        missing = {}
+        for key, row in zip(keys, x):
+            if key in self._fitness_cache:
+                self._fitness_cache.move_to_end(key)
+            elif key not in missing:
+                missing[key] = row
+
+        fitness = {key: self._fitness_cache[key] for key in keys if key not in missing}
+        results = self.map_vectors(list(missing.values()))
+        for key, result in zip(missing, results):
+            fitness[key] = result
+            self._fitness_cache[key] = result
+        while len(self._fitness_cache) > self.FITNESS_CACHE_SIZE:
+            self._fitness_cache.popitem(last=False)
+
+        return np.array([fitness[key] for key in keys], dtype=np.float64).reshape(-1, 2)
+
+    def _simulate_serially(self, vectors):
+        """Simulate assignment vectors one after another in this process"""
+        return [self.simulation.run_with_assignment(x) for x in vectors]
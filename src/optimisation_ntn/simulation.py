@@ -12,7 +12,7 @@ from optimisation_ntn.networks.request import Request, RequestStatus
 
 from .algorithms.assignment.matrix_based import MatrixBasedAssignment
 from .algorithms.assignment.strategy_factory import AssignmentStrategyFactory
-from .matrices.decision_matrices import DecisionMatrices, MatrixType
+from .matrices.decision_matrices import DecisionMatrices
 from .networks.network import Network
 from .nodes.base_station import BaseStation
 from .nodes.haps import HAPS
@@ -65,6 +65,9 @@ class Simulation:
         self.time_step = config.time_step
         self.max_time = config.max_time
         self.seed = config.seed
+        # Generator drawing the user positions and request times, seeded like
+        # the random module
+        self.rng = np.random.default_rng(config.seed)
         self.debug = config.debug
         self.matrices = DecisionMatrices(dimension=config.user_count)
         self.network = Network(debug=self.debug, power_strategy=config.power_strategy)
@@ -84,9 +87,6 @@ class Simulation:
         # Initialize stats only when needed
         self.request_state_stats = {}
 
-        # UI variables
-        self.steps_since_last_ui_update = 0
-
         # self.reset()
         self.reset()
 
@@ -156,9 +156,12 @@ class Simulation:
                 assignment_strategy_name = self.optimizer
             else:
                 assignment_strategy_name = self.assignment_strategy.get_name()
-            # Save energy history to csv
+            # Save energy history to csv, in float64 like the rest of the results
             energy_history = pd.DataFrame(
-                {str(node): node.energy_history for node in self.network.nodes}
+                {
+                    str(node): node.energy_history.astype(np.float64)
+                    for node in self.network.nodes
+                }
             )
             energy_history.to_csv(
                 f"output/energy_history_{self.config.power_strategy}_"
@@ -180,7 +183,7 @@ class Simulation:
         """Evaluate QoS satisfaction for all requests."""
         satisfied_requests = 0
         failed_requests = 0
-        for user in [n for n in self.network.nodes if isinstance(n, UserDevice)]:
+        for user in self.network.user_nodes:
             for request in user.current_requests:
                 if request.status == RequestStatus.COMPLETED:
                     satisfied_requests += 1
@@ -200,66 +203,54 @@ class Simulation:
 
     def step(self) -> bool:
         """Run simulation for a single step."""
-        # Get new requests from request matrix for this tick
-        new_requests = self.matrices.get_matrix(MatrixType.REQUEST)[
-            :, self.current_step
-        ]
-
         # Get user devices and compute nodes
         user_devices = self.network.user_nodes
 
-        # Create new requests for users
-        for i, request_flag in enumerate(new_requests):
-            if request_flag == 1:
-                user = user_devices[i]
-
-                # Create the request
-                request = Request(
-                    tick=self.current_step,
-                    tick_time=self.time_step,
-                    initial_node=user,
-                    get_tick=self.get_current_tick,
-                    debug=self.debug,
-                )
-                user.add_request(request)
-
-                # Get available compute nodes
-                compute_nodes = self.network.get_compute_nodes(
-                    request, check_state=False
-                )
-
-                # Use assignment strategy to select node
-                best_node, best_path, _ = self.assignment_strategy.select_compute_node(
-                    request, self.network.compute_nodes
-                )
-
-                # If we found a suitable compute node, assign it and initialize routing
-                if best_node:
-                    user.assign_target_node(request, best_node)
-                    request.path = best_path
-                    request.path_index = 1
-                    request.update_status(RequestStatus.IN_TRANSIT)
-
-                    # Add request to first transmission queue
-                    current_node = request.path[0]
-                    next_node = request.path[1]
-
-                    # Find the appropriate link
-                    for link in self.network.communication_links:
-                        if link.node_a == current_node and link.node_b == next_node:
-                            link.add_to_queue(request)
-                            request.next_node = next_node
-                            self.debug_print(
-                                f"Added request {request.id} to transmission queue: "
-                                f"{current_node} -> {next_node}"
-                            )
-                            break
+        # Create new requests for the users flagged in this tick only
+        for i in self.matrices.requesting_users(self.current_step).tolist():
+            user = user_devices[i]
+
+            # Create the request
+            request = Request(
+                tick=self.current_step,
+                tick_time=self.time_step,
+                initial_node=user,
+                get_tick=self.get_current_tick,
+                debug=self.debug,
+            )
+            user.add_request(request)
 
-                else:
-                    request.update_status(RequestStatus.FAILED)
-                    self.debug_print(f"No available compute nodes found for {user}")
+            # Use assignment strategy to select node
+            best_node, best_path, _ = self.assignment_strategy.select_compute_node(
+                request, self.network.compute_nodes
+            )
+
+            # If we found a suitable compute node, assign it and initialize routing
+            if best_node:
+                user.assign_target_node(request, best_node)
+                request.path = best_path
+                request.path_index = 1
+                request.update_status(RequestStatus.IN_TRANSIT)
+
+                # Add request to first transmission queue
+                current_node = request.path[0]
+                next_node = request.path[1]
+
+                # Find the appropriate link
+                link = self.network.link_by_endpoints.get((current_node, next_node))
+                if link is not None:
+                    link.add_to_queue(request)
+                    request.next_node = next_node
+                    self.debug_print(
+                        f"Added request {request.id} to transmission queue: "
+                        f"{current_node} -> {next_node}"
+                    )
+
+            else:
+                request.update_status(RequestStatus.FAILED)
+                self.debug_print(f"No available compute nodes found for {user}")
 
-                self.total_requests += 1
+            self.total_requests += 1
 
         # Update network state
         self.network.tick(self.time_step)
@@ -270,10 +261,7 @@ class Simulation:
         # Track statistics only when needed
         if self.track_stats:
             # Add the energy consumed in this step to history
-            step_energy = sum(
-                node.energy_history[-1] if node.energy_history else 0
-                for node in self.network.compute_nodes
-            )
+            step_energy = sum(node.tick_energy for node in self.network.compute_nodes)
             self.system_energy_history.append(step_energy)
 
             # Update request statistics
@@ -288,8 +276,14 @@ class Simulation:
 
         return self.current_time < self.max_time
 
-    def reset(self):
-        """Reset the simulation to initial state."""
+    def reset(self, user_count: Optional[int] = None):
+        """Reset the simulation to initial state.
+
+        Args:
+            user_count: New number of users, the current one if not given
+        """
+        if user_count is not None:
+            self.user_count = user_count
         self.current_time = 0.0
         self.current_step = 0
         self.network = Network(
@@ -306,6 +300,7 @@ class Simulation:
         # Reset energy consumption for all nodes
         if self.seed is not None:
             random.seed(self.seed)
+        self.rng = np.random.default_rng(self.seed)
 
         self.initialize_default_nodes()
         self.initialize_matrices()
@@ -337,45 +332,37 @@ class Simulation:
     def set_nodes(self, node_type: type, count: int):
         """Generic method to set nodes of a specific type."""
         # Remove existing nodes of this type
-        self.network.nodes = [
-            node for node in self.network.nodes if not isinstance(node, node_type)
-        ]
+        self.network.remove_nodes(node_type)
 
         # Add new nodes based on type
         if node_type == BaseStation:
             start_x = -(count - 1) * 1.5 / 2
-            for i in range(count):
-                x_pos = start_x + (i * 1.5)
-                self.network.add_node(
-                    node_type(
-                        i,
-                        Position(x_pos, 0),
-                        debug=self.debug,
-                    )
-                )
+            nodes = [
+                node_type(i, Position(start_x + (i * 1.5), 0), debug=self.debug)
+                for i in range(count)
+            ]
 
         elif node_type == HAPS:
             start_x = -(count - 1) * 2 / 2
             height = 20
-            for i in range(count):
-                x_pos = start_x + (i * 2)
-                self.network.add_node(
-                    node_type(
-                        i,
-                        Position(x_pos, height),
-                    )
-                )
+            nodes = [
+                node_type(i, Position(start_x + (i * 2), height)) for i in range(count)
+            ]
 
         elif node_type == UserDevice:
-            for i in range(count):
-                x_pos = random.uniform(-4, 4)
-                height = -2
-                self.network.add_node(
-                    node_type(
-                        i,
-                        Position(x_pos, height),
-                    )
-                )
+            # Draw all the user positions at once
+            x_positions = self.rng.uniform(-4, 4, size=count)
+            height = -2
+            nodes = [
+                node_type(i, Position(x_pos, height))
+                for i, x_pos in enumerate(x_positions.tolist())
+            ]
+
+        else:
+            return
+
+        # Links are rebuilt once for the whole batch
+        self.network.add_nodes(nodes)
 
     def initialize_matrices(self):
         """Initialize all matrices needed for simulation"""
@@ -384,10 +371,11 @@ class Simulation:
 
         # Generate request matrix using the new counting method
         self.matrices.generate_request_matrix(
-            num_requests=self.network.count_nodes_by_type(UserDevice),
+            num_requests=len(self.network.user_nodes),
             num_steps=matrix_size,
             time=self.time_step,
             time_buffer=2,
+            rng=self.rng,
         )
 
         # Generate coverage matrix
@@ -0,0 +1,90 @@
+""" Image assets decoded in the background """
+
+from pathlib import Path
+
+from PySide6 import QtCore, QtGui
+
+IMAGE_DIR = "images"
+
+
+class _DecodeTask(QtCore.QRunnable):
+    """Decode one image file on a thread pool worker"""
+
+    def __init__(self, assets, name, path):
+        super().__init__()
+        self.assets = assets
+        self.name = name
+        self.path = path
+
+    def run(self):
+        """Read the image and hand it back to the GUI thread"""
+        image = QtGui.QImageReader(self.path).read()
+        self.assets.image_decoded.emit(self.name, image)
+
+
+class Assets(QtCore.QObject):
+    """Pixmaps of the images folder, keyed by file name without extension"""
+
+    loaded = QtCore.Signal()
+    image_decoded = QtCore.Signal(str, QtGui.QImage)
+
+    _instance = None
+
+    def __init__(self):
+        super().__init__()
+        self._pixmaps = {}
+        self._scaled_keys = set()  # QPixmapCache keys of the resized pixmaps
+        self._pending = 0
+        # Queued to the GUI thread, where QPixmap can safely be created
+        self.image_decoded.connect(self._on_image_decoded)
+
+    @classmethod
+    def instance(cls):
+        """Get the shared assets instance"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def load_all(self, directory=IMAGE_DIR):
+        """Decode every PNG of the directory on the global thread pool"""
+        paths = sorted(Path(directory).glob("*.png"))
+        self._pending += len(paths)
+        for path in paths:
+            QtCore.QThreadPool.globalInstance().start(
+                _DecodeTask(self, path.stem, str(path))
+            )
+
+    def is_ready(self, *names):
+        """Whether all the given images have been decoded"""
+        return all(name in self._pixmaps for name in names)
+
+    def pixmap(self, name):
+        """Get a decoded pixmap, or a null pixmap if it is not ready yet"""
+        return self._pixmaps.get(name, QtGui.QPixmap())
+
+    def scaled_pixmap(self, name, width, height):
+        """Get a decoded pixmap resized to the given size
+
+        Resized pixmaps are kept in the application wide QPixmapCache, so they
+        are only resampled again once Qt evicts them.
+        """
+        if name not in self._pixmaps:
+            return QtGui.QPixmap()
+
+        key = f"{name}:{width}x{height}"
+        pixmap = QtGui.QPixmapCache.find(key)
+        if pixmap is None:
+            pixmap = self._pixmaps[name].scaled(width, height)
+            QtGui.QPixmapCache.insert(key, pixmap)
+            self._scaled_keys.add(key)
+        return pixmap
+
+    def _on_image_decoded(self, name, image):
+        """Convert a decoded image to a pixmap on the GUI thread"""
+        self._pixmaps[name] = QtGui.QPixmap.fromImage(image)
+        for key in [key for key in self._scaled_keys if key.split(":")[0] == name]:
+            QtGui.QPixmapCache.remove(key)
+            self._scaled_keys.discard(key)
+        self._pending -= 1
+        if self._pending == 0:
+            self.loaded.emit()
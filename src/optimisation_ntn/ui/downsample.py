@@ -0,0 +1,56 @@
+""" Downsampling of chart series """
+
+import numpy as np
+
+
+def lttb(x_values, y_values, n_out):
+    """Downsample a series with the Largest-Triangle-Three-Buckets algorithm
+
+    The first and last points are kept, every other output point is the
+    point of its bucket forming the largest triangle with the previously
+    kept point and the average of the next bucket, which preserves peaks
+    that an even pick would skip.
+
+    Args:
+        x_values: X values of the series, increasing
+        y_values: Y values of the series
+        n_out: Maximum number of points to return, at least 3
+
+    Returns:
+        tuple: (x, y) arrays of at most n_out points
+    """
+    x_values = np.asarray(x_values, dtype=np.float64)
+    y_values = np.asarray(y_values, dtype=np.float64)
+    size = len(x_values)
+    if n_out >= size or n_out < 3:
+        return x_values, y_values
+
+    # Bucket edges of the points between the first and the last one
+    edges = np.linspace(1, size - 1, n_out - 1).astype(np.intp)
+    # Average of every bucket, the last point stands for the bucket after the last
+    sums_x = np.add.reduceat(x_values[1 : size - 1], edges[:-1] - 1)
+    sums_y = np.add.reduceat(y_values[1 : size - 1], edges[:-1] - 1)
+    counts = np.diff(edges)
+    avg_x = np.append(sums_x / counts, x_values[-1])
+    avg_y = np.append(sums_y / counts, y_values[-1])
+
+    # The kept point of a bucket depends on the previous one, the loop runs in
+    # plain Python which beats NumPy calls on buckets of a few points
+    xs, ys = x_values.tolist(), y_values.tolist()
+    next_x, next_y = avg_x[1:].tolist(), avg_y[1:].tolist()
+    bounds = edges.tolist()
+    picks = [0]
+    prev_x, prev_y = xs[0], ys[0]
+    for i in range(n_out - 2):
+        # Twice the area of the triangles, the constant factor does not matter
+        dx, dy = prev_x - next_x[i], next_y[i] - prev_y
+        best, best_area = bounds[i], -1.0
+        for j in range(bounds[i], bounds[i + 1]):
+            area = abs(dx * (ys[j] - prev_y) - (prev_x - xs[j]) * dy)
+            if area > best_area:
+                best, best_area = j, area
+        picks.append(best)
+        prev_x, prev_y = xs[best], ys[best]
+    picks.append(size - 1)
+
+    return x_values[picks], y_values[picks]
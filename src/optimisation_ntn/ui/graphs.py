@@ -2,13 +2,99 @@
 
 import random
 
+import numpy as np
 from PySide6 import QtCore, QtGui
 from PySide6.QtCharts import QChart, QChartView, QLineSeries, QValueAxis
 
 from optimisation_ntn.ui.dialogs.enlarged_graph import EnlargedGraphDialog
+from optimisation_ntn.ui.downsample import lttb
 from optimisation_ntn.ui.theme_manager import ThemeManager
 
 
+TOTAL_ENERGY_KEY = "Total Energy"
+FLUSH_INTERVAL_MS = 50  # Push buffered samples to the chart at 20 Hz
+USE_OPENGL = True  # Rasterize line series on the GPU
+Y_AXIS_HEADROOM = 1.2  # Top of the y-axis relative to the largest sample
+Y_AXIS_SLACK = 1.1  # Tolerated drift of the largest sample before a rescale
+
+
+class SampleBuffer:
+    """Ring buffer holding the most recent samples of a series"""
+
+    def __init__(self, size):
+        self.size = size
+        self.count = 0  # Total number of samples ever added
+        self._ring = np.empty(size, dtype=np.float64)
+        self._ring_idx = 0
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    def extend(self, values):
+        """Append samples, only the most recent ones are kept once the ring is full"""
+        values = np.asarray(values, dtype=np.float64)
+        self.count += len(values)
+        values = values[-self.size :]
+        count = len(values)
+        end = self._ring_idx + count
+        if end <= self.size:
+            self._ring[self._ring_idx : end] = values
+        else:
+            split = self.size - self._ring_idx
+            self._ring[self._ring_idx :] = values[:split]
+            self._ring[: count - split] = values[split:]
+        self._ring_idx = end % self.size
+
+    @property
+    def first_x(self):
+        """Index of the oldest sample in view"""
+        return self.count - len(self)
+
+    @property
+    def last_x(self):
+        """Index of the newest sample"""
+        return self.count - 1
+
+    @property
+    def x(self):
+        """X values of the samples in view"""
+        return np.arange(self.first_x, self.count, dtype=np.float64)
+
+    @property
+    def y(self):
+        """Y values of the samples in view, oldest first"""
+        if self.count < self.size:
+            return self._ring[: self.count]
+        return np.concatenate(
+            (self._ring[self._ring_idx :], self._ring[: self._ring_idx])
+        )
+
+    def max(self):
+        """Largest sample in view"""
+        return float(self._ring[: len(self)].max())
+
+    def push_to(self, series, max_points=None):
+        """Replace the content of a chart series with the samples in view
+
+        Args:
+            series: Chart series to fill
+            max_points: Downsample to at most this many samples, if given
+        """
+        x_values, y_values = self.x, self.y
+        if max_points:
+            x_values, y_values = lttb(x_values, y_values, max_points)
+        try:
+            series.replaceNp(x_values, y_values)
+        except AttributeError:
+            # PySide6 builds without the NumPy overloads
+            series.replace(
+                [
+                    QtCore.QPointF(x, y)
+                    for x, y in zip(x_values.tolist(), y_values.tolist())
+                ]
+            )
+
+
 class EnergyGraph:
     """Energy graph class"""
 
@@ -16,6 +102,8 @@ class EnergyGraph:
         self.parent = parent
         self.chart = QChart()
         self.chart.setTitle(title)
+        # Series are refilled many times per second, never animate the changes
+        self.chart.setAnimationOptions(QChart.AnimationOption.NoAnimation)
 
         # Set initial theme (dark by default)
         ThemeManager.apply_theme_to_chart(self.chart, True)
@@ -31,6 +119,7 @@ class EnergyGraph:
         self.axis_y.setTitleText(
             "Energy (J)" if title == "Total Energy" else "Energy per tick (W)"
         )
+        self.axis_y.setRange(0, 100)
 
         # Add axes to chart
         self.chart.addAxis(self.axis_x, QtCore.Qt.AlignmentFlag.AlignBottom)
@@ -39,26 +128,32 @@ class EnergyGraph:
         # Initialize series
         if title == "Total Energy":
             self.series = QLineSeries()
-            self.chart.addSeries(self.series)
-            self.series.attachAxis(self.axis_x)
-            self.series.attachAxis(self.axis_y)
+            self._add_series(self.series)
             self.point_count = 0  # Track points for total energy
+            self.running_total = 0.0  # Last value of the cumulative series
         else:
             self.node_series = {}  # Dictionary to store node series
 
         # Create chart view
         self.chart_view = QChartView(self.chart)
-        self.chart_view.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
+        if not USE_OPENGL:
+            # OpenGL series do their own multisampling
+            self.chart_view.setRenderHint(QtGui.QPainter.RenderHint.Antialiasing)
 
         # Enable mouse tracking and connect double-click event
         self.chart_view.setMouseTracking(True)
         self.chart_view.mouseDoubleClickEvent = self.show_enlarged_graph
 
-        # Track current step
-        self.current_step = 0
+        self.max_points = 1000  # Number of most recent points kept in view
 
-        self.max_points = 1000  # Maximum number of points to display
-        self.decimation_factor = 1  # Will be adjusted based on data size
+        # Samples are buffered per series and pushed to the chart in bulk
+        self._buffers = {}
+        self._dirty = set()
+        self._detached_series = {}  # Removed node series kept for reuse
+        self._axis_ranges = {"x": (0, 100), "y": (0, 100)}
+        self._flush_timer = QtCore.QTimer()
+        self._flush_timer.timeout.connect(self._flush)
+        self._flush_timer.start(FLUSH_INTERVAL_MS)
 
     def show_enlarged_graph(self, event):
         """Show the enlarged version of the graph"""
@@ -69,126 +164,163 @@ class EnergyGraph:
             dialog = EnlargedGraphDialog(self.chart_view, self.parent)
             dialog.exec()
 
-    def decimate_data(self, series):
-        """Reduce number of points in a series if it exceeds max_points"""
-        point_count = series.count()
-        if point_count > self.max_points:
-            self.decimation_factor = (
-                point_count + self.max_points - 1
-            ) // self.max_points
-
-            # Create new decimated series
-            decimated_series = QLineSeries()
-            decimated_series.setName(series.name())
-
-            # Keep first and last points, decimate points in between
-            decimated_series.append(series.at(0).x(), series.at(0).y())
-            for i in range(1, point_count - 1, self.decimation_factor):
-                point = series.at(i)
-                decimated_series.append(point.x(), point.y())
-            decimated_series.append(
-                series.at(point_count - 1).x(), series.at(point_count - 1).y()
-            )
+    def _add_series(self, series):
+        """Add a series to the chart on the shared value axes"""
+        # OpenGL series require regular value axes, which these are
+        series.setUseOpenGL(USE_OPENGL)
+        self.chart.addSeries(series)
+        series.attachAxis(self.axis_x)
+        series.attachAxis(self.axis_y)
+
+    def _series_for(self, key):
+        """Get the chart series backing a buffer key"""
+        if key == TOTAL_ENERGY_KEY:
+            return getattr(self, "series", None)
+        return self.node_series.get(key)
+
+    def _flush(self):
+        """Replace the content of every series that received new samples"""
+        if not self._dirty:
+            return
 
-            return decimated_series
-        return series
+        # More than one sample per horizontal pixel of the plot is not visible.
+        # Hidden charts have no laid out plot area yet, keep all their samples.
+        max_points = None
+        if self.chart_view.isVisible():
+            max_points = max(int(self.chart.plotArea().width()), 3)
+        for key in self._dirty:
+            series = self._series_for(key)
+            if series is not None:
+                self._buffers[key].push_to(series, max_points)
+        self._dirty.clear()
+
+        self.update_x_axis_range()
+        self.update_y_axis_range()
 
-    def add_point(self, value):
-        """Add a point to the total energy series"""
-        if not hasattr(self, "series"):
+    def add_cumulative_points(self, values):
+        """Add the running totals of several samples to the total energy series"""
+        if not hasattr(self, "series") or np.size(values) == 0:
             return
 
-        self.series.append(self.point_count, value)
-        self.point_count += 1
-
-        # Apply decimation if needed
-        if self.series.count() > self.max_points:
-            decimated = self.decimate_data(self.series)
-            self.chart.removeSeries(self.series)
-            self.series = decimated
-            self.chart.addSeries(self.series)
-            self.series.attachAxis(self.axis_x)
-            self.series.attachAxis(self.axis_y)
-
-        # Update axis ranges
-        if self.point_count >= self.axis_x.max():
-            new_max = self.point_count + int(self.point_count * 0.1)
-            self.axis_x.setRange(0, new_max)
-        self.update_y_axis_range()
+        totals = np.cumsum(values, dtype=np.float64) + self.running_total
+        if TOTAL_ENERGY_KEY not in self._buffers:
+            self._buffers[TOTAL_ENERGY_KEY] = SampleBuffer(self.max_points)
+        self._buffers[TOTAL_ENERGY_KEY].extend(totals)
+        self._dirty.add(TOTAL_ENERGY_KEY)
+        self.point_count += len(totals)
+        self.running_total = float(totals[-1])
+
+    def add_node_points(self, node_name, values):
+        """Add several points to a node's energy series at once"""
+        if not hasattr(self, "node_series") or np.size(values) == 0:
+            return
+
+        self._ensure_node_series(node_name)
+        if node_name not in self._buffers:
+            self._buffers[node_name] = SampleBuffer(self.max_points)
+        self._buffers[node_name].extend(values)
+        self._dirty.add(node_name)
 
-    def add_node_point(self, node_name, value):
-        """Add a point to a node's energy series"""
+    def set_node_series(self, node_name, values):
+        """Replace the energy series of a node with a full history
+
+        The series is filled with a single replace instead of one append per
+        sample.
+        """
         if not hasattr(self, "node_series"):
             return
 
+        self._buffers.pop(node_name, None)
+        self.add_node_points(node_name, values)
+        self._flush()
+
+    def _ensure_node_series(self, node_name):
+        """Create the series of a node if it is not in the chart yet"""
         if node_name not in self.node_series:
-            series = QLineSeries()
-            series.setName(node_name)
-            # Assign a random color
-            color = QtGui.QColor(
-                random.randint(50, 255),
-                random.randint(50, 255),
-                random.randint(50, 255),
-            )
-            series.setColor(color)
+            # Reuse the series of a previously removed node before creating one
+            series = self._detached_series.pop(node_name, None)
+            if series is None:
+                series = QLineSeries()
+                series.setName(node_name)
+                # Assign a random color
+                color = QtGui.QColor(
+                    random.randint(50, 255),
+                    random.randint(50, 255),
+                    random.randint(50, 255),
+                )
+                series.setColor(color)
+            else:
+                series.clear()
             self.node_series[node_name] = series
-            self.chart.addSeries(series)
-            series.attachAxis(self.axis_x)
-            series.attachAxis(self.axis_y)
-
-        series = self.node_series[node_name]
-        current_count = series.count()
-        series.append(current_count, value)
-
-        # Apply decimation if needed
-        if series.count() > self.max_points:
-            decimated = self.decimate_data(series)
-            self.chart.removeSeries(series)
-            self.node_series[node_name] = decimated
-            self.chart.addSeries(decimated)
-            decimated.attachAxis(self.axis_x)
-            decimated.attachAxis(self.axis_y)
-
-        # Update axis ranges
-        if current_count >= self.axis_x.max():
-            new_max = current_count + int(current_count * 0.1)
-            self.axis_x.setRange(0, new_max)
-        self.update_y_axis_range()
-        self.chart.legend().setVisible(len(self.node_series) > 1)
+            self._add_series(series)
+            self.chart.legend().setVisible(len(self.node_series) > 1)
 
     def remove_node_series(self, node_text):
         """Remove a node's energy series"""
         if hasattr(self, "node_series") and node_text in self.node_series:
-            series = self.node_series[node_text]
+            series = self.node_series.pop(node_text)
             self.chart.removeSeries(series)
-            del self.node_series[node_text]
+            self._detached_series[node_text] = series
+            self._buffers.pop(node_text, None)
+            self._dirty.discard(node_text)
             self.update_y_axis_range()
             self.chart.legend().setVisible(len(self.node_series) > 1)
 
+    def update_x_axis_range(self):
+        """Slide the x-axis over the buffered window of samples"""
+        buffers = [buffer for buffer in self._buffers.values() if len(buffer)]
+        if not buffers:
+            return
+
+        first = min(buffer.first_x for buffer in buffers)
+        last = max(buffer.last_x for buffer in buffers)
+        x_min, x_max = self._axis_ranges["x"]
+        if last >= x_max or first > x_min:
+            self._set_axis_range("x", first, max(last + int(last * 0.1), first + 100))
+
     def update_y_axis_range(self):
-        """Update the y-axis range based on the maximum value"""
+        """Rescale the y-axis when the maximum value leaves its watermarks
+
+        Rather than following every new maximum, the axis is only rescaled
+        once the maximum comes within Y_AXIS_SLACK of the top, or drops that
+        far below where Y_AXIS_HEADROOM would put it.
+        """
         max_energy = 0
-        if hasattr(self, "node_series"):
-            for series in self.node_series.values():
-                for i in range(series.count()):
-                    max_energy = max(max_energy, series.at(i).y())
-        elif hasattr(self, "series"):
-            for i in range(self.series.count()):
-                max_energy = max(max_energy, self.series.at(i).y())
+        for buffer in self._buffers.values():
+            if len(buffer):
+                max_energy = max(max_energy, buffer.max())
+
+        if max_energy <= 0:
+            return
 
-        if max_energy > 0:
-            self.axis_y.setRange(0, max_energy * 1.2)
+        top = self._axis_ranges["y"][1]
+        if (
+            max_energy * Y_AXIS_SLACK > top
+            or max_energy * Y_AXIS_HEADROOM * Y_AXIS_SLACK < top
+        ):
+            self._set_axis_range("y", 0, max_energy * Y_AXIS_HEADROOM)
+
+    def _set_axis_range(self, axis_name, minimum, maximum):
+        """Set an axis range, skipping the axis relayout when it is unchanged"""
+        if self._axis_ranges[axis_name] == (minimum, maximum):
+            return
+
+        self._axis_ranges[axis_name] = (minimum, maximum)
+        axis = self.axis_x if axis_name == "x" else self.axis_y
+        axis.setRange(minimum, maximum)
 
     def clear(self):
         """Clear all data from the graph"""
+        self._buffers.clear()
+        self._dirty.clear()
+
         if hasattr(self, "node_series"):
-            for series in list(self.node_series.values()):
-                self.chart.removeSeries(series)
-            self.node_series.clear()
+            for node_text in list(self.node_series):
+                self.remove_node_series(node_text)
         elif hasattr(self, "series"):
             self.series.clear()
             self.point_count = 0
+            self.running_total = 0.0
 
-        self.axis_y.setRange(0, 100)  # Reset to default range
-        self.axis_x.setRange(0, 100)  # Reset x-axis range
-        self.current_step = 0  # Reset step counter
+        self._set_axis_range("y", 0, 100)  # Reset to default range
+        self._set_axis_range("x", 0, 100)  # Reset x-axis range
@@ -7,23 +7,63 @@ from PySide6 import QtGui, QtWidgets
 from optimisation_ntn.nodes.base_station import BaseStation
 from optimisation_ntn.nodes.haps import HAPS
 from optimisation_ntn.nodes.user_device import UserDevice
+from optimisation_ntn.ui.assets import Assets
 
 
 class NodeVisualizer:
     """Node visualizer class"""
 
+    # Inset of label text, the padding of the rich text items labels used to be
+    TEXT_MARGIN = 4
+    LABEL_BRUSH = QtGui.QBrush(QtGui.QColor("white"))
+    _label_advances = {}
+
+    # Close-up view height of each node type
+    NODE_Y_POSITIONS = {BaseStation: 250, HAPS: 100, UserDevice: 270}
+
+    @staticmethod
+    def add_label(scene, label, x_pos, y_pos, brush=LABEL_BRUSH):
+        """Add a plain text label whose box starts at the given position"""
+        text = QtWidgets.QGraphicsSimpleTextItem(label)
+        text.setBrush(brush)
+        scene.addItem(text)
+        NodeVisualizer.move_label(text, x_pos, y_pos)
+        return text
+
+    @staticmethod
+    def move_label(text, x_pos, y_pos):
+        """Move a label so that its box starts at the given position"""
+        text.setPos(
+            x_pos + NodeVisualizer.TEXT_MARGIN, y_pos + NodeVisualizer.TEXT_MARGIN
+        )
+
+    @staticmethod
+    def label_box_width(text):
+        """Get the width of the box of a label, padding included
+
+        The text advance is measured once per label text, labels all share the
+        default font.
+        """
+        label = text.text()
+        advance = NodeVisualizer._label_advances.get(label)
+        if advance is None:
+            advance = QtGui.QFontMetricsF(text.font()).horizontalAdvance(label)
+            NodeVisualizer._label_advances[label] = advance
+        return advance + 2 * NodeVisualizer.TEXT_MARGIN
+
     @staticmethod
     def add_processing_requests(scene, node, node_x, node_y):
         """Add visual representation of requests being processed by a node"""
         if not (hasattr(node, "processing_queue") and node.processing_queue):
             return
 
-        request_pixmap = QtGui.QPixmap("images/file.png")
+        if not Assets.instance().is_ready("file"):
+            return
+
+        request_pixmap = Assets.instance().scaled_pixmap("file", 15, 15)
         if request_pixmap.isNull():
             print("ERROR: Could not load file.png for processing requests")
             return
-
-        request_pixmap = request_pixmap.scaled(15, 15)
         NodeVisualizer._draw_requests_semicircle(
             scene, node.processing_queue, node_x, node_y, request_pixmap
         )
@@ -61,61 +101,33 @@ class NodeVisualizer:
         )
         scene.addItem(request_item)
 
-        text = scene.addText(f"R{request.id}")
-        text.setDefaultTextColor(QtGui.QColor("white"))
-        text.setPos(
-            x - text.boundingRect().width() / 2,
+        text = NodeVisualizer.add_label(scene, f"R{request.id}", 0, 0)
+        NodeVisualizer.move_label(
+            text,
+            x - NodeVisualizer.label_box_width(text) / 2,
             y - request_pixmap.height() - 15,
         )
 
     @staticmethod
-    def add_in_transit_requests(scene, link, source_pos, target_pos):
-        """Add visual representation of requests in transit on a link"""
-        if link.transmission_queue:
-            request_pixmap = QtGui.QPixmap("images/file.png")
-            if request_pixmap.isNull():
-                print("ERROR: Could not load file.png for in-transit requests")
-                return
-
-            request_pixmap = request_pixmap.scaled(15, 15)
-
-            for i, request in enumerate(link.transmission_queue):
-                # Calculate position along the link
-                if i == 0:  # First request - show actual progress
-                    progress = min(1.0, max(0.0, link.request_progress / request.size))
-                else:  # Queue other requests behind the first one
-                    progress = max(0.0, (i * -0.1))  # Space them out behind the source
-
-                # Calculate position along the line
-                x = source_pos[0] + (target_pos[0] - source_pos[0]) * progress
-                y = source_pos[1] + (target_pos[1] - source_pos[1]) * progress
-
-                # Add request icon
-                request_item = QtWidgets.QGraphicsPixmapItem(request_pixmap)
-                request_item.setPos(
-                    x - request_pixmap.width() / 2, y - request_pixmap.height() / 2
-                )
-                scene.addItem(request_item)
-
-                # Add request ID label
-                text = scene.addText(f"R{request.id}")
-                text.setDefaultTextColor(QtGui.QColor("white"))
-                text.setPos(
-                    x - text.boundingRect().width() / 2,
-                    y - request_pixmap.height() - 15,
-                )
+    def in_transit_positions(in_transit, source_pos, target_pos):
+        """Get the scene position of every request in transit on a link
+
+        Args:
+            in_transit: (request id, progress along the link) of the requests
+
+        Yields:
+            tuple: (request id, x, y) for each request in transit
+        """
+        for request_id, progress in in_transit:
+            # Calculate position along the line
+            x = source_pos[0] + (target_pos[0] - source_pos[0]) * progress
+            y = source_pos[1] + (target_pos[1] - source_pos[1]) * progress
+            yield request_id, x, y
 
     @staticmethod
     def get_node_positions(node, pixmap_width, pixmap_height):
         """Calculate node positions based on node type"""
         x_pos = node.position.x * 50
-        if isinstance(node, BaseStation):
-            y_pos = 250
-        elif isinstance(node, HAPS):
-            y_pos = 100
-        elif isinstance(node, UserDevice):
-            y_pos = 270
-        else:
-            y_pos = 0
+        y_pos = NodeVisualizer.NODE_Y_POSITIONS.get(type(node), 0)
 
         return (x_pos + pixmap_width / 2, y_pos + pixmap_height / 2)
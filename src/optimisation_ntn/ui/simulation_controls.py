@@ -1,5 +1,6 @@
 """ Simulation controls UI for managing simulations and their parameters """
 
+import contextlib
 from typing import Literal, cast
 
 import numpy as np
@@ -13,6 +14,30 @@ from optimisation_ntn.nodes.haps import HAPS
 from optimisation_ntn.nodes.user_device import UserDevice
 from optimisation_ntn.simulation import Simulation, SimulationConfig
 from optimisation_ntn.algorithms.assignment.matrix_based import MatrixBasedAssignment
+from optimisation_ntn.ui.simulation_worker import SimulationWorker
+
+
+@contextlib.contextmanager
+def _blocked(*widgets):
+    """Block the signals of widgets, restoring their previous state on exit"""
+    previous = [widget.blockSignals(True) for widget in widgets]
+    try:
+        yield
+    finally:
+        for widget, was_blocked in zip(widgets, previous):
+            widget.blockSignals(was_blocked)
+
+
+def _set_value(widget, value):
+    """Set the value of a spin box, skipping the update when it is unchanged"""
+    if widget.value() != value:
+        widget.setValue(value)
+
+
+def _set_text(combo, text):
+    """Select the entry of a combo box, skipping the update when it is unchanged"""
+    if combo.currentText() != text:
+        combo.setCurrentText(text)
 
 
 # pylint: disable=too-many-instance-attributes
@@ -34,14 +59,10 @@ class SimulationControls:
         self.strategy_combos = {}
         self.widget = None
         self._assignment_vector = None
+        self._last_selected_row = -1
 
-        # Initialize timer
-        self.timer = QtCore.QTimer()
-        self.timer.timeout.connect(self.simulation_step)
-
-        # Initialize simulation timer
-        self.simulation_timer = QtCore.QTimer()
-        self.simulation_timer.timeout.connect(self.simulation_step)
+        # Worker thread stepping the current simulation while it runs
+        self.worker = None
 
         # Create UI components
         self._create_ui_components()
@@ -223,65 +244,65 @@ class SimulationControls:
         """Update UI controls to match current simulation"""
         if self.current_simulation:
             # Block signals during update
-            self.node_inputs["bs"].blockSignals(True)
-            self.node_inputs["haps"].blockSignals(True)
-            self.node_inputs["users"].blockSignals(True)
-            self.time_inputs["step_duration"].blockSignals(True)
-            self.strategy_combos["power"].blockSignals(True)
-            self.strategy_combos["assignment"].blockSignals(True)
-            self.time_inputs["max_time"].blockSignals(True)
-
-            # Count nodes of each type
-            bs_count = self.current_simulation.network.count_nodes_by_type(BaseStation)
-            haps_count = self.current_simulation.network.count_nodes_by_type(HAPS)
-            users_count = self.current_simulation.network.count_nodes_by_type(
-                UserDevice
+            with _blocked(
+                self.node_inputs["bs"],
+                self.node_inputs["haps"],
+                self.node_inputs["users"],
+                self.time_inputs["step_duration"],
+                self.strategy_combos["power"],
+                self.strategy_combos["assignment"],
+                self.time_inputs["max_time"],
+            ):
+                self._sync_inputs()
+
+    def _sync_inputs(self):
+        """Show the parameters of the current simulation in the inputs"""
+        # Count nodes of each type
+        network = self.current_simulation.network
+        bs_count = len(network.base_stations)
+        haps_count = len(network.haps_nodes)
+        users_count = len(network.user_nodes)
+
+        # Update UI values
+        _set_value(self.node_inputs["bs"], bs_count)
+        _set_value(self.node_inputs["haps"], haps_count)
+        _set_value(self.node_inputs["users"], users_count)
+        _set_value(self.time_inputs["step_duration"], self.current_simulation.time_step)
+
+        # Update strategy combos
+        if hasattr(self.current_simulation, "power_strategy"):
+            _set_text(
+                self.strategy_combos["power"],
+                self.current_simulation.config.power_strategy,
             )
 
-            # Update UI values
-            self.node_inputs["bs"].setValue(bs_count)
-            self.node_inputs["haps"].setValue(haps_count)
-            self.node_inputs["users"].setValue(users_count)
-            self.time_inputs["step_duration"].setValue(
-                self.current_simulation.time_step
+        if self.current_simulation.optimizer:
+            _set_text(
+                self.strategy_combos["assignment"], self.current_simulation.optimizer
             )
+        elif hasattr(self.current_simulation.assignment_strategy, "__class__"):
+            strategy_name = (
+                self.current_simulation.assignment_strategy.__class__.__name__
+            )
+            _set_text(self.strategy_combos["assignment"], strategy_name)
 
-            # Update strategy combos
-            if hasattr(self.current_simulation, "power_strategy"):
-                self.strategy_combos["power"].setCurrentText(
-                    self.current_simulation.config.power_strategy
-                )
-
-            if self.current_simulation.optimizer:
-                self.strategy_combos["assignment"].setCurrentText(
-                    self.current_simulation.optimizer
-                )
-            elif hasattr(self.current_simulation.assignment_strategy, "__class__"):
-                strategy_name = (
-                    self.current_simulation.assignment_strategy.__class__.__name__
-                )
-                self.strategy_combos["assignment"].setCurrentText(strategy_name)
-
-            # Update max time
-            self.time_inputs["max_time"].setValue(int(self.current_simulation.max_time))
+        # Update max time
+        _set_value(self.time_inputs["max_time"], int(self.current_simulation.max_time))
 
-            # Re-enable signals
-            self.node_inputs["bs"].blockSignals(False)
-            self.node_inputs["haps"].blockSignals(False)
-            self.node_inputs["users"].blockSignals(False)
-            self.time_inputs["step_duration"].blockSignals(False)
-            self.strategy_combos["power"].blockSignals(False)
-            self.strategy_combos["assignment"].blockSignals(False)
-            self.time_inputs["max_time"].blockSignals(False)
+    @property
+    def is_running(self):
+        """Whether a worker is currently stepping the simulation"""
+        return self.worker is not None and self.worker.is_running()
 
     def toggle_simulation(self):
         """Toggle between running and paused states"""
         if self.current_simulation:
-            if self.simulation_timer.isActive():
+            if self.is_running:
                 # Pause simulation
-                self.simulation_timer.stop()
+                self.stop_worker()
                 self.current_simulation.is_paused = True
                 self.run_pause_btn.setText("Resume")
+                self.parent.on_simulation_paused()
             else:
                 # Start/Resume simulation
                 self.start_simulation()
@@ -290,45 +311,64 @@ class SimulationControls:
     def start_simulation(self):
         """Start or resume simulation"""
         if self.current_simulation:
+            self.stop_worker()
             self.current_simulation.is_paused = False
             speed = self.time_inputs["simulation_speed"].value()
-            interval = int(1000 / speed)  # Convert steps/s to timer interval in ms
-            self.simulation_timer.start(interval)
+            self.worker = SimulationWorker(self.current_simulation, speed)
+            # Receivers must be QObjects of the GUI thread, signals connected
+            # to plain callables would be queued to the worker thread instead
+            queued = QtCore.Qt.ConnectionType.QueuedConnection
+            self.worker.progress.connect(self.parent.on_simulation_step, queued)
+            self.worker.finished_sim.connect(self.parent.on_simulation_finished, queued)
+            self.worker.failed.connect(self.parent.on_simulation_failed, queued)
+            self.worker.start()
             self.run_pause_btn.setText("Pause")
 
-    def simulation_step(self):
-        """Handle one simulation step"""
-        if self.current_simulation and not self.current_simulation.is_paused:
-            try:
-                can_continue = self.current_simulation.step()
+    def stop_worker(self):
+        """Stop the simulation worker if any, returns whether it was running"""
+        if self.worker is None:
+            return False
 
-                # Notify parent of step completion
-                self.parent.on_simulation_step()
+        was_running = self.worker.is_running()
+        self.worker.stop()
+        self.worker = None
+        return was_running
 
-                if not can_continue:
-                    self.simulation_timer.stop()
-                    self.run_pause_btn.setText("Run")
-                    QtWidgets.QMessageBox.information(
-                        self.parent,
-                        "Simulation Complete",
-                        "The simulation has reached the end of available data.",
-                    )
+    @contextlib.contextmanager
+    def _worker_paused(self):
+        """Stop the worker while the simulation is modified, then resume it"""
+        was_running = self.stop_worker()
+        try:
+            yield
+        finally:
+            if was_running:
+                self.start_simulation()
 
-            except IndexError as e:
-                self.simulation_timer.stop()
-                self.run_pause_btn.setText("Run")
-                QtWidgets.QMessageBox.warning(
-                    self.parent,
-                    "Simulation Ended",
-                    f"The simulation has reached the end of the request data matrix. {e}",
-                )
+    def on_simulation_finished(self):
+        """Handle the worker reaching the end of the simulation"""
+        self.stop_worker()
+        self.run_pause_btn.setText("Run")
+        QtWidgets.QMessageBox.information(
+            self.parent,
+            "Simulation Complete",
+            "The simulation has reached the end of available data.",
+        )
+
+    def on_simulation_failed(self, error):
+        """Handle the worker stopping on an error raised by a simulation step"""
+        self.stop_worker()
+        self.run_pause_btn.setText("Run")
+        QtWidgets.QMessageBox.warning(
+            self.parent,
+            "Simulation Stopped",
+            f"The simulation stopped on an error while stepping. {error}",
+        )
 
     def reset_simulation(self):
         """Reset the current simulation"""
         if self.current_simulation:
-            # Stop timer if running
-            if self.timer.isActive():
-                self.timer.stop()
+            # Stop worker if running
+            if self.stop_worker():
                 self.run_pause_btn.setText("Run")
 
             # Re-enable step duration input
@@ -356,9 +396,19 @@ class SimulationControls:
     def update_simulation_selection(self):
         """Update the selected simulation"""
         try:
+            # Skip spurious selection signals that keep the same row
+            row = self.sim_list.currentRow()
+            if row == self._last_selected_row:
+                return
+            self._last_selected_row = row
+
             if self.sim_list.currentItem():
                 simulation_name = self.sim_list.currentItem().text()
                 if simulation_name in self.simulations:
+                    # The worker is bound to the previously selected simulation
+                    if self.stop_worker():
+                        self.current_simulation.is_paused = True
+                        self.run_pause_btn.setText("Resume")
                     self.current_simulation = self.simulations[simulation_name]
                     self.update_ui_parameters()
                     # Notify parent of selection change
@@ -398,20 +448,23 @@ class SimulationControls:
     def _on_bs_value_changed(self, value):
         """Handle base station count changes"""
         if self.current_simulation:
-            self.current_simulation.set_nodes(BaseStation, value)
-            self.parent.on_nodes_updated()
+            with self._worker_paused():
+                self.current_simulation.set_nodes(BaseStation, value)
+                self.parent.on_nodes_updated()
 
     def _on_haps_value_changed(self, value):
         """Handle HAPS count changes"""
         if self.current_simulation:
-            self.current_simulation.set_nodes(HAPS, value)
-            self.parent.on_nodes_updated()
+            with self._worker_paused():
+                self.current_simulation.set_nodes(HAPS, value)
+                self.parent.on_nodes_updated()
 
     def _on_users_value_changed(self, value):
         """Handle user count changes"""
         if self.current_simulation:
-            self.current_simulation.set_nodes(UserDevice, value)
-            self.parent.on_nodes_updated()
+            with self._worker_paused():
+                self.current_simulation.set_nodes(UserDevice, value)
+                self.parent.on_nodes_updated()
 
     def _on_step_duration_changed(self, value):
         """Handle step duration changes"""
@@ -420,11 +473,9 @@ class SimulationControls:
 
     def _on_simulation_speed_changed(self, value):
         """Handle simulation speed changes"""
-        if value > 0:
-            # Only update timer interval, don't change step duration
-            interval = int(1000 / value)
-            if self.simulation_timer.isActive():
-                self.simulation_timer.setInterval(interval)
+        if value > 0 and self.worker is not None:
+            # Only update stepping rate, don't change step duration
+            self.worker.set_speed(value)
 
     def _on_assignment_strategy_changed(self, strategy):
         """Handle assignment strategy changes"""
@@ -444,6 +495,9 @@ class SimulationControls:
     def _on_power_strategy_changed(self, strategy):
         """Handle power strategy changes"""
         if self.current_simulation:
+            if self.stop_worker():
+                self.run_pause_btn.setText("Run")
+
             # Update power strategy
             self.current_simulation.power_strategy = strategy
 
@@ -486,7 +540,7 @@ class SimulationControls:
         random_btn = QtWidgets.QPushButton("Generate Random Vector")
 
         def set_random_vector():
-            vector = np.random.randint(0, n_nodes, n_users)
+            vector = self.current_simulation.rng.integers(0, n_nodes, n_users)
             text_input.setText(",".join(map(str, vector)))
 
         random_btn.clicked.connect(set_random_vector)
@@ -512,6 +566,9 @@ class SimulationControls:
                     # Store the vector for later use
                     self._assignment_vector = vector
 
+                    if self.stop_worker():
+                        self.run_pause_btn.setText("Run")
+
                     # Reset simulation first
                     self.current_simulation.reset()
 
@@ -619,9 +676,15 @@ class SimulationControls:
         )
 
         if reply == QtWidgets.QMessageBox.StandardButton.Yes:
+            if self.stop_worker():
+                self.run_pause_btn.setText("Run")
+
             # Remove from simulations dict
             del self.simulations[simulation_name]
 
+            # The row left selected after removal holds another simulation
+            self._last_selected_row = -1
+
             # Remove from list widget
             self.sim_list.takeItem(self.sim_list.row(self.sim_list.currentItem()))
 
@@ -640,6 +703,10 @@ class SimulationControls:
         if not self.current_simulation:
             return
 
+        # Stop any running simulation
+        if self.stop_worker():
+            self.run_pause_btn.setText("Run")
+
         # Store current values
         config = SimulationConfig(
             time_step=self.time_inputs[
@@ -669,11 +736,6 @@ class SimulationControls:
         self.simulations[simulation_name] = new_simulation
         self.current_simulation = new_simulation
 
-        # Stop any running simulation
-        if self.simulation_timer.isActive():
-            self.simulation_timer.stop()
-            self.run_pause_btn.setText("Run")
-
         # Update UI without resetting parameters
         self.update_ui_parameters_preserve()
         self.parent.on_simulation_reset()
@@ -688,11 +750,11 @@ class SimulationControls:
         """Update UI controls while preserving current parameter values"""
         if self.current_simulation:
             # Only update what needs to be synchronized
-            self.time_inputs["simulation_speed"].blockSignals(True)
-            self.time_inputs["simulation_speed"].setValue(
-                1.0 / self.current_simulation.time_step
-            )
-            self.time_inputs["simulation_speed"].blockSignals(False)
+            with _blocked(self.time_inputs["simulation_speed"]):
+                _set_value(
+                    self.time_inputs["simulation_speed"],
+                    1.0 / self.current_simulation.time_step,
+                )
 
             # Update strategy combos if needed
             if hasattr(self.current_simulation, "power_strategy"):
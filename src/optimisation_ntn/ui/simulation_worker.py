@@ -0,0 +1,252 @@
+""" Worker stepping a simulation outside of the GUI thread """
+
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from PySide6 import QtCore
+
+
+@dataclass(frozen=True)
+class NodeEnergySnapshot:
+    """Energy statistics of a node, with the samples recorded since the last ones"""
+
+    sample_count: int  # Samples recorded so far, new_samples are the last ones
+    new_samples: np.ndarray
+    current: float
+    peak: float
+    total: float  # Sum of the samples, the cumulated energy includes turn on peaks
+    energy_consumed: float
+    battery_capacity: float
+
+    @property
+    def average(self) -> float:
+        """Average energy consumed per tick"""
+        return self.total / self.sample_count if self.sample_count else 0.0
+
+    @classmethod
+    def from_node(cls, node, previous: Optional["NodeEnergySnapshot"] = None):
+        """Capture the energy of a node, the samples after previous ones are new"""
+        history = node.energy_history
+        if previous is None or previous.sample_count > len(history):
+            previous = None
+        start = previous.sample_count if previous else 0
+        new_samples = history[start:].copy()
+
+        peak = previous.peak if previous else -np.inf
+        total = previous.total if previous else 0.0
+        if len(new_samples):
+            peak = max(peak, float(new_samples.max()))
+            total += float(new_samples.sum(dtype=np.float64))
+
+        return cls(
+            sample_count=len(history),
+            new_samples=new_samples,
+            current=float(history[-1]) if len(history) else 0.0,
+            peak=peak,
+            total=total,
+            energy_consumed=node.energy_consumed,
+            battery_capacity=node.battery_capacity,
+        )
+
+
+@dataclass(frozen=True)
+class NetworkSnapshot:
+    """State of the network drawn by the views, its topology excluded
+
+    Nodes and links are only added or removed with the worker stopped, the
+    views read them from the network and their state from the snapshot.
+    """
+
+    version: int  # Version of the network topology the state belongs to
+    current_step: int
+    node_states: np.ndarray  # Power state of each node, in network.nodes order
+    leo_angles: np.ndarray  # Orbital angle of each LEO satellite, in degrees
+    # (request id, progress along the link) of the requests in transit, by
+    # index of their link in network.communication_links
+    in_transit: Dict[int, Tuple[Tuple[int, float], ...]]
+
+    @classmethod
+    def from_simulation(cls, simulation):
+        """Capture the state of the network of a simulation not stepped meanwhile"""
+        network = simulation.network
+        in_transit = {}
+        for link_id, link in enumerate(network.communication_links):
+            queue = link.transmission_queue
+            if queue:
+                # The first request shows its actual progress, the others
+                # wait at the source
+                progress = min(1.0, max(0.0, link.request_progress / queue[0].size))
+                in_transit[link_id] = ((queue[0].id, progress),) + tuple(
+                    (request.id, 0.0) for request in queue[1:]
+                )
+
+        return cls(
+            version=network.version,
+            current_step=simulation.current_step,
+            node_states=np.fromiter(
+                (node.state for node in network.nodes),
+                dtype=bool,
+                count=len(network.nodes),
+            ),
+            leo_angles=network.leo_angles(),
+            in_transit=in_transit,
+        )
+
+
+# pylint: disable=too-many-instance-attributes
+@dataclass(frozen=True)
+class SimulationSnapshot:
+    """Immutable state of a simulation after a step, safe to share across threads"""
+
+    current_time: float
+    current_step: int
+    system_energy_consumed: float
+    energy_sample_count: int  # System energy samples recorded so far
+    new_energy_samples: Tuple[float, ...]  # The last system energy samples
+    request_state_stats: Dict
+    nodes: Optional[Dict[str, NodeEnergySnapshot]]  # By display key, if captured
+    network: Optional[NetworkSnapshot]  # Captured along with the nodes
+
+    @classmethod
+    def from_simulation(
+        cls,
+        simulation,
+        energy_start: int = 0,
+        previous_nodes: Optional[Dict[str, NodeEnergySnapshot]] = None,
+    ):
+        """Capture the current state of a simulation
+
+        Args:
+            simulation: Simulation to capture, not stepped meanwhile
+            energy_start: System energy samples sent in earlier snapshots
+            previous_nodes: Node energy of the previous capture, the nodes and
+                the network are only captured when given, an empty dict for a
+                first capture
+        """
+        history = simulation.system_energy_history
+        energy_sample_count = len(history)
+        nodes = None
+        network = None
+        if previous_nodes is not None:
+            nodes = {
+                node.display_key: NodeEnergySnapshot.from_node(
+                    node, previous_nodes.get(node.display_key)
+                )
+                for node in simulation.network.nodes
+            }
+            network = NetworkSnapshot.from_simulation(simulation)
+
+        return cls(
+            current_time=simulation.current_time,
+            current_step=simulation.current_step,
+            system_energy_consumed=simulation.system_energy_consumed,
+            energy_sample_count=energy_sample_count,
+            new_energy_samples=tuple(history[energy_start:energy_sample_count]),
+            request_state_stats=dict(simulation.request_state_stats),
+            nodes=nodes,
+            network=network,
+        )
+
+
+class SimulationWorker(QtCore.QObject):
+    """Steps a simulation on its own thread and reports its progress
+
+    The worker is moved to a dedicated QThread, its signals reach the GUI
+    thread through queued connections.
+    """
+
+    NODE_CAPTURE_INTERVAL = 1 / 60  # Seconds between two captures of the nodes
+
+    progress = QtCore.Signal(object)
+    finished_sim = QtCore.Signal()
+    failed = QtCore.Signal(str)
+
+    def __init__(self, simulation, steps_per_second):
+        super().__init__()
+        self.simulation = simulation
+        self.steps_per_second = steps_per_second
+        self._stop_requested = False
+        # What the snapshots sent so far already hold
+        self._energy_sample_count = 0
+        self._node_energy = {}
+        self._last_node_capture = -np.inf
+
+        self._thread = QtCore.QThread()
+        self.moveToThread(self._thread)
+        self._thread.started.connect(self.run_loop)
+
+    def start(self):
+        """Start stepping the simulation on the worker thread"""
+        self._thread.start()
+
+    def is_running(self):
+        """Whether the worker thread is still stepping the simulation"""
+        return self._thread.isRunning()
+
+    def set_speed(self, steps_per_second):
+        """Change the stepping rate of the running worker"""
+        self.steps_per_second = steps_per_second
+
+    def stop(self):
+        """Stop the worker after its current step and wait for it to exit"""
+        self._stop_requested = True
+        self._thread.quit()
+        self._thread.wait()
+
+    @QtCore.Slot()
+    def run_loop(self):
+        """Step the simulation until it ends or the worker is stopped"""
+        try:
+            self._step_until_stopped()
+        finally:
+            # Nothing else runs on the worker thread, let it exit
+            self._thread.quit()
+
+    def snapshot(self, capture_nodes: bool) -> SimulationSnapshot:
+        """Capture what changed in the simulation since the previous snapshot
+
+        Capturing the nodes and the network walks every node and link, it is
+        done at most once per NODE_CAPTURE_INTERVAL unless forced.
+        """
+        now = time.perf_counter()
+        capture_nodes = (
+            capture_nodes or now - self._last_node_capture >= self.NODE_CAPTURE_INTERVAL
+        )
+        snapshot = SimulationSnapshot.from_simulation(
+            self.simulation,
+            self._energy_sample_count,
+            self._node_energy if capture_nodes else None,
+        )
+        self._energy_sample_count = snapshot.energy_sample_count
+        if snapshot.nodes is not None:
+            self._node_energy = snapshot.nodes
+            self._last_node_capture = now
+        return snapshot
+
+    def _step_until_stopped(self):
+        """Step the simulation at the requested rate"""
+        next_step_time = time.perf_counter()
+        while not self._stop_requested:
+            try:
+                can_continue = self.simulation.step()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                # Report any failure, the thread would otherwise exit silently
+                self.failed.emit(f"{type(e).__name__}: {e}")
+                return
+
+            # Only snapshots cross the thread boundary, never the simulation
+            self.progress.emit(self.snapshot(capture_nodes=not can_continue))
+
+            if not can_continue:
+                self.finished_sim.emit()
+                return
+
+            # Pace the loop to the requested number of steps per second
+            next_step_time += 1.0 / self.steps_per_second
+            delay = next_step_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_step_time = time.perf_counter()
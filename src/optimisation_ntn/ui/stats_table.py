@@ -2,6 +2,8 @@
 
 from PySide6 import QtCore, QtWidgets
 
+from optimisation_ntn.ui.simulation_worker import NodeEnergySnapshot
+
 
 class NodeStatsTable(QtWidgets.QTableWidget):
     """Node stats table"""
@@ -9,6 +11,8 @@ class NodeStatsTable(QtWidgets.QTableWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.checkbox_signal_connected = False
+        # Row of each node, keyed by the name shown in the table
+        self._row_by_key = {}
         self.setup_ui()
 
     def setup_ui(self):
@@ -31,12 +35,12 @@ class NodeStatsTable(QtWidgets.QTableWidget):
             QtWidgets.QHeaderView.ResizeMode.ResizeToContents
         )
 
-    def update_stats(self, nodes, on_checkbox_change):
-        """Update the statistics table with current node data"""
+    def set_nodes(self, nodes, on_checkbox_change):
+        """Rebuild the rows of the table for a new list of nodes"""
         self.blockSignals(True)
 
         # Get current state
-        checked_nodes = self._get_checked_nodes()
+        checked_nodes = self.get_checked_nodes()
         selected_rows = self._get_selected_rows()
 
         # Update table size if needed
@@ -44,6 +48,7 @@ class NodeStatsTable(QtWidgets.QTableWidget):
             self.setRowCount(len(nodes))
 
         # Update each row
+        self._row_by_key = {}
         for row, node in enumerate(nodes):
             self._update_row(row, node, checked_nodes)
 
@@ -51,7 +56,24 @@ class NodeStatsTable(QtWidgets.QTableWidget):
         self._restore_selection(selected_rows)
         self._ensure_checkbox_signal(on_checkbox_change)
 
-    def _get_checked_nodes(self):
+    def refresh_values(self, node_energy):
+        """Update the statistics of nodes whose rows already exist
+
+        Args:
+            node_energy: NodeEnergySnapshot of the nodes, by display key
+        """
+        self.setUpdatesEnabled(False)
+        self.blockSignals(True)
+        try:
+            for node_text, energy in node_energy.items():
+                row = self._row_by_key.get(node_text)
+                if row is not None:
+                    self._update_statistics(row, energy)
+        finally:
+            self.blockSignals(False)
+            self.setUpdatesEnabled(True)
+
+    def get_checked_nodes(self):
         """Get set of currently checked node names"""
         checked_nodes = set()
         for row in range(self.rowCount()):
@@ -59,7 +81,7 @@ class NodeStatsTable(QtWidgets.QTableWidget):
             if checkbox_item and checkbox_item.checkState() == QtCore.Qt.Checked:
                 node_item = self.item(row, 1)
                 if node_item:
-                    checked_nodes.add(node_item.text())
+                    checked_nodes.add(self.node_key(node_item))
         return checked_nodes
 
     def _get_selected_rows(self):
@@ -68,7 +90,8 @@ class NodeStatsTable(QtWidgets.QTableWidget):
 
     def _update_row(self, row, node, checked_nodes):
         """Update a single row in the table"""
-        node_text = f"{type(node).__name__} {node.node_id}"
+        node_text = node.display_key
+        self._row_by_key[node_text] = row
 
         # Update checkbox
         self._update_checkbox(row, node_text, checked_nodes)
@@ -77,7 +100,7 @@ class NodeStatsTable(QtWidgets.QTableWidget):
         self._update_node_name(row, node_text)
 
         # Update statistics
-        self._update_statistics(row, node)
+        self._update_statistics(row, NodeEnergySnapshot.from_node(node))
 
     def _update_checkbox(self, row, node_text, checked_nodes):
         """Update checkbox state for a row"""
@@ -97,21 +120,28 @@ class NodeStatsTable(QtWidgets.QTableWidget):
         """Update node name cell"""
         name_item = self.item(row, 1)
         if not name_item or name_item.text() != node_text:
-            self.setItem(row, 1, QtWidgets.QTableWidgetItem(node_text))
-
-    def _update_statistics(self, row, node):
-        """Update statistics cells for a node"""
-        if node.energy_history:
-            self._update_energy_stats(row, node)
+            name_item = QtWidgets.QTableWidgetItem(node_text)
+            name_item.setData(QtCore.Qt.ItemDataRole.UserRole, node_text)
+            self.setItem(row, 1, name_item)
+
+    @staticmethod
+    def node_key(name_item):
+        """Get the display key of the node of a name cell"""
+        return name_item.data(QtCore.Qt.ItemDataRole.UserRole)
+
+    def _update_statistics(self, row, energy):
+        """Update statistics cells from the energy snapshot of a node"""
+        if energy.sample_count:
+            self._update_energy_stats(row, energy)
         else:
-            self._update_empty_stats(row, node)
+            self._update_empty_stats(row, energy)
 
-    def _update_energy_stats(self, row, node):
+    def _update_energy_stats(self, row, energy):
         """Update statistics when energy history exists"""
-        current = node.energy_history[-1]
-        peak = max(node.energy_history)
-        avg = sum(node.energy_history) / len(node.energy_history)
-        cumulated = node.energy_consumed
+        current = energy.current
+        peak = energy.peak
+        avg = energy.average
+        cumulated = energy.energy_consumed
 
         # Update energy values
         self._update_cell(row, 2, f"{current:.2f}")
@@ -121,20 +151,20 @@ class NodeStatsTable(QtWidgets.QTableWidget):
 
         # Update battery
         remaining_str = (
-            f"{node.battery_capacity - node.energy_consumed:.2f}"
-            if node.battery_capacity > 0
+            f"{energy.battery_capacity - energy.energy_consumed:.2f}"
+            if energy.battery_capacity > 0
             else "∞"
         )
         self._update_cell(row, 6, remaining_str)
 
-    def _update_empty_stats(self, row, node):
+    def _update_empty_stats(self, row, energy):
         """Update statistics when no energy history exists"""
         for col in range(2, 6):
             self._update_cell(row, col, "0.00")
 
         # Set remaining battery
         battery_str = (
-            f"{node.battery_capacity:.2f}" if node.battery_capacity > 0 else "∞"
+            f"{energy.battery_capacity:.2f}" if energy.battery_capacity > 0 else "∞"
         )
         self._update_cell(row, 6, battery_str)
 
@@ -153,5 +183,7 @@ class NodeStatsTable(QtWidgets.QTableWidget):
     def _update_cell(self, row, col, value):
         """Helper method to update table cell only if value changed"""
         current_item = self.item(row, col)
-        if not current_item or current_item.text() != value:
+        if not current_item:
             self.setItem(row, col, QtWidgets.QTableWidgetItem(value))
+        elif current_item.text() != value:
+            current_item.setText(value)
@@ -1,5 +1,7 @@
 """ Theme manager """
 
+import functools
+
 from PySide6 import QtGui
 
 
@@ -45,8 +47,9 @@ class ThemeManager:
     }
 
     @staticmethod
+    @functools.lru_cache(maxsize=2)
     def get_theme_stylesheet(is_dark):
-        """Get the stylesheet for the current theme"""
+        """Get the stylesheet for the current theme, built once per theme"""
         theme = ThemeManager.DARK_THEME if is_dark else ThemeManager.LIGHT_THEME
         return f"""
             QMainWindow, QDialog {{
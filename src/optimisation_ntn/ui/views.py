@@ -1,243 +1,508 @@
 """ Close up view and far view panel """
 
+import functools
 import math
 
+import numpy as np
 from PySide6 import QtCore, QtGui, QtWidgets
 
 from optimisation_ntn.nodes.base_station import BaseStation
 from optimisation_ntn.nodes.haps import HAPS
 from optimisation_ntn.nodes.leo import LEO
 from optimisation_ntn.nodes.user_device import UserDevice
+from optimisation_ntn.ui.assets import Assets
 from optimisation_ntn.ui.node_visualizer import NodeVisualizer
 from optimisation_ntn.ui.theme_manager import ThemeManager
 
 
 class CloseUpView:
-    """Close up view"""
+    """Close up view, keeping one scene whose items are updated in place"""
+
+    GROUND_LEVEL = 270
+    FLOOR_HEIGHT = 200
+    X_SCALE = 50  # Scene units per unit of node x position
+    REQUEST_ICON_SIZE = 15
+    IMAGES = ("haps", "base_station", "person", "leo", "file")
+    LINK_COLORS = ("cyan", "yellow", "orange", "white")
+    # Index in LINK_COLORS of the links of each node type, the lowest wins
+    LINK_COLOR_IDS = {LEO: 0, BaseStation: 1, HAPS: 2}
+    DEFAULT_LINK_COLOR_ID = 3
+    LINK_PENS = tuple(QtGui.QPen(QtGui.QColor(color), 1) for color in LINK_COLORS)
+    _backdrop_brushes = {}
+    _label_widths = {}
+
+    def __init__(self):
+        self.scene = QtWidgets.QGraphicsScene(-200, 0, 400, 400)
+        # Satellites and requests move every frame, keeping a BSP index of a
+        # few dozen items up to date costs more than scanning them
+        self.scene.setItemIndexMethod(QtWidgets.QGraphicsScene.ItemIndexMethod.NoIndex)
+        self._is_dark_theme = None
+
+        # Topology the node items were built for, see _topology_changed
+        self._synced_network = None
+        self._synced_version = None
+        self._drawn_frame = None  # State of the network last drawn
+
+        self._node_items = {}  # Node -> items drawing it
+        self._powered_items = {}  # Node -> pixmap item dimmed while turned off
+        self._leo_items = {}  # LEO -> (pixmap item, label item)
+        # Center of the pixmap item of each node, in network.nodes order,
+        # NaN for satellites out of sight
+        self._node_rows = {}
+        self._positions = np.empty((0, 2))
+        self._link_color_ids = np.empty(0, dtype=np.uint8)  # Into LINK_PENS
+        # One path item per link colour, refilled every frame above the nodes
+        self._link_items = []
+        for pen in CloseUpView.LINK_PENS:
+            item = self.scene.addPath(QtGui.QPainterPath(), pen)
+            item.setOpacity(0.5)
+            item.setZValue(0.5)
+            self._link_items.append(item)
+        self._request_items = {}  # Request id in transit -> (icon, label, width)
+
+    def load(self, view, network, state, show_links=True, is_dark_theme=True):
+        """Update the close-up view of the network
+
+        Args:
+            network: Network whose nodes and links are drawn, None to clear
+            state: NetworkSnapshot of the network, to draw its nodes with
+        """
+        if view.scene() is not self.scene:
+            view.setScene(self.scene)
+            view.centerOn(0, 200)
+
+        if network is None or state is None:
+            self._set_link_paths(())
+            self._remove_request_items(keep=())
+            self._clear_nodes()
+            self.scene.setBackgroundBrush(QtGui.QBrush())
+            self._is_dark_theme = None
+            return
 
-    @staticmethod
-    def load(view, simulation, show_links=True, is_dark_theme=True):
-        """Load the close-up view of the network"""
-        scene = QtWidgets.QGraphicsScene(-200, 0, 400, 400)
-        if not simulation:
-            view.setScene(scene)
+        # Sky and floor are painted by a cached background brush
+        if is_dark_theme != self._is_dark_theme:
+            self.scene.setBackgroundBrush(CloseUpView._backdrop_brush(is_dark_theme))
+            self._is_dark_theme = is_dark_theme
+
+        # Node images are decoded in the background, redraw once they are ready
+        assets = Assets.instance()
+        if not assets.is_ready(*CloseUpView.IMAGES):
             return
 
-        # Add green floor
-        scene.addRect(
-            -800,
-            270,
-            1600,
-            200,
-            QtGui.QPen(QtGui.QColor("darkgreen")),
-            QtGui.QBrush(QtGui.QColor("darkgreen")),
-        )
+        # Wait for a state of the current topology
+        if state.version != network.version:
+            return
 
-        # Add sky
-        sky_color = "#1e1e1e" if is_dark_theme else "#87CEEB"  # Dark blue or light blue
-        scene.addRect(
-            -800,
-            0,
-            1600,
-            270,
-            QtGui.QPen(QtGui.QColor(sky_color)),
-            QtGui.QBrush(QtGui.QColor(sky_color)),
-        )
+        # Nodes, satellites and requests only change when the simulation steps
+        frame = (network, state.version, state.current_step, show_links)
+        if frame == self._drawn_frame:
+            return
+
+        if self._topology_changed(network):
+            self._build_nodes(network, assets)
 
-        # Load node images
-        haps_pixmap = QtGui.QPixmap("images/haps.png").scaled(30, 30)
-        bs_pixmap = QtGui.QPixmap("images/base_station.png").scaled(30, 30)
-        user_pixmap = QtGui.QPixmap("images/person.png").scaled(20, 20)
-        leo_pixmap = QtGui.QPixmap("images/leo.png").scaled(30, 30)
-
-        node_positions = {}
-
-        # Add nodes to the scene
-        for node in simulation.network.nodes:
-            if isinstance(node, HAPS):
-                CloseUpView._add_haps(scene, node, haps_pixmap, node_positions)
-            elif isinstance(node, BaseStation):
-                CloseUpView._add_base_station(scene, node, bs_pixmap, node_positions)
-            elif isinstance(node, UserDevice):
-                CloseUpView._add_user(scene, node, user_pixmap, node_positions)
-            elif isinstance(node, LEO) and node.is_visible:
-                CloseUpView._add_leo(scene, node, leo_pixmap, node_positions)
+        # Only power states and satellites change between frames
+        node_states = state.node_states.tolist()
+        for node, item in self._powered_items.items():
+            item.setOpacity(1.0 if node_states[self._node_rows[node]] else 0.2)
+        self._update_leos(network, state.leo_angles)
 
         # Draw communication links if enabled
+        shown_requests = set()
         if show_links:
-            CloseUpView._draw_links(scene, simulation, node_positions)
-
-        view.setScene(scene)
-        view.centerOn(0, 200)
+            self._draw_links(network, state.in_transit, shown_requests)
+        else:
+            self._set_link_paths(())
+        self._remove_request_items(keep=shown_requests)
+        self._drawn_frame = frame
 
     def reset(self, view):
         """Reset the close-up view"""
         view.setScene(None)
 
-    @staticmethod
-    def _add_haps(scene, node, pixmap, node_positions):
-        x_pos = node.position.x * 50
-        y_pos = 100
-        item = QtWidgets.QGraphicsPixmapItem(pixmap)
-        item.setPos(x_pos, y_pos)
+    def _topology_changed(self, network):
+        """Whether nodes were added or removed since the items were built"""
+        return (
+            network is not self._synced_network
+            or network.version != self._synced_version
+        )
 
-        if not node.state:
-            item.setOpacity(0.2)
+    def _build_nodes(self, network, assets):
+        """Create the items of every node of the network"""
+        self._clear_nodes()
+        self._synced_network = network
+        self._synced_version = network.version
+
+        self._node_rows = {node: i for i, node in enumerate(network.nodes)}
+        self._positions = np.full((len(network.nodes), 2), np.nan)
+        self._link_color_ids = np.fromiter(
+            (
+                CloseUpView._get_link_color_id(link.node_a, link.node_b)
+                for link in network.communication_links
+            ),
+            dtype=np.uint8,
+            count=len(network.communication_links),
+        )
 
-        scene.addItem(item)
-        node_positions[node] = (x_pos + pixmap.width() / 2, y_pos + pixmap.height() / 2)
+        haps_pixmap = assets.scaled_pixmap("haps", 30, 30)
+        bs_pixmap = assets.scaled_pixmap("base_station", 30, 30)
+        user_pixmap = assets.scaled_pixmap("person", 20, 20)
+        leo_pixmap = assets.scaled_pixmap("leo", 30, 30)
 
-        text = scene.addText(f"HAPS {node.node_id}")
-        text.setDefaultTextColor(QtGui.QColor("white"))
-        text.setPos(
-            x_pos + pixmap.width() / 2 - text.boundingRect().width() / 2,
-            y_pos - 20,
+        # Fixed nodes are placed from the cached x coordinates of each type
+        fixed_node_painters = (
+            (BaseStation, self._add_base_station, bs_pixmap),
+            (HAPS, self._add_haps, haps_pixmap),
+            (UserDevice, self._add_user, user_pixmap),
+        )
+        for node_type, add_node, pixmap in fixed_node_painters:
+            x_positions = network.node_positions_x(node_type) * CloseUpView.X_SCALE
+            for node, x_pos in zip(
+                network.nodes_of_type(node_type), x_positions.tolist()
+            ):
+                add_node(node, x_pos, pixmap)
+
+        for leo in network.leo_nodes:
+            self._add_leo(leo, leo_pixmap)
+
+    def _clear_nodes(self):
+        """Remove the items of every node from the scene"""
+        for items in self._node_items.values():
+            for item in items:
+                self.scene.removeItem(item)
+
+        self._node_items.clear()
+        self._powered_items.clear()
+        self._leo_items.clear()
+        self._node_rows.clear()
+        self._positions = np.empty((0, 2))
+        self._link_color_ids = np.empty(0, dtype=np.uint8)
+        self._synced_network = None
+        self._synced_version = None
+        self._drawn_frame = None
+
+    def _set_link_paths(self, paths):
+        """Replace the links of every colour, clearing those without a path"""
+        for i, item in enumerate(self._link_items):
+            item.setPath(paths[i] if i < len(paths) else QtGui.QPainterPath())
+
+    def _place_request(self, request_id, x, y):
+        """Center the icon of a request in transit, creating its items once"""
+        items = self._request_items.get(request_id)
+        if items is None:
+            size = CloseUpView.REQUEST_ICON_SIZE
+            icon = QtWidgets.QGraphicsPixmapItem(
+                Assets.instance().scaled_pixmap("file", size, size)
+            )
+            self.scene.addItem(icon)
+            label = self._add_label(f"R{request_id}", 0, 0)
+            # Stay above the links
+            icon.setZValue(1)
+            label.setZValue(1)
+            items = (icon, label, NodeVisualizer.label_box_width(label))
+            self._request_items[request_id] = items
+
+        icon, label, label_width = items
+        half_size = CloseUpView.REQUEST_ICON_SIZE / 2
+        icon.setPos(x - half_size, y - half_size)
+        NodeVisualizer.move_label(
+            label, x - label_width / 2, y - CloseUpView.REQUEST_ICON_SIZE - 15
         )
 
+    def _remove_request_items(self, keep):
+        """Remove the items of the requests that are no longer in transit"""
+        for request_id in [r for r in self._request_items if r not in keep]:
+            icon, label, _ = self._request_items.pop(request_id)
+            self.scene.removeItem(icon)
+            self.scene.removeItem(label)
+
     @staticmethod
-    def _add_base_station(scene, node, pixmap, node_positions):
-        x_pos = node.position.x * 50
-        y_pos = 250
+    def _label_width(scene, label):
+        """Get the width of a node label, measured once per label"""
+        width = CloseUpView._label_widths.get(label)
+        if width is None:
+            metrics = QtGui.QFontMetrics(scene.font())
+            width = metrics.horizontalAdvance(label) + 2 * NodeVisualizer.TEXT_MARGIN
+            CloseUpView._label_widths[label] = width
+        return width
+
+    @staticmethod
+    def _backdrop_brush(is_dark_theme):
+        """Get the sky and floor background brush, built once per theme"""
+        brush = CloseUpView._backdrop_brushes.get(is_dark_theme)
+        if brush is None:
+            # Dark blue or light blue sky
+            sky_color = QtGui.QColor("#1e1e1e" if is_dark_theme else "#87CEEB")
+            floor_color = QtGui.QColor("darkgreen")
+            bottom = CloseUpView.GROUND_LEVEL + CloseUpView.FLOOR_HEIGHT
+            horizon = CloseUpView.GROUND_LEVEL / bottom
+
+            # Hard stop at the ground level, padded above and below
+            gradient = QtGui.QLinearGradient(0, 0, 0, bottom)
+            gradient.setColorAt(0, sky_color)
+            gradient.setColorAt(horizon, sky_color)
+            gradient.setColorAt(horizon + 1e-4, floor_color)
+            gradient.setColorAt(1, floor_color)
+
+            brush = QtGui.QBrush(gradient)
+            CloseUpView._backdrop_brushes[is_dark_theme] = brush
+        return brush
+
+    def _add_pixmap_item(self, node, pixmap, x_pos, y_pos):
+        """Add the image of a node and record its center"""
         item = QtWidgets.QGraphicsPixmapItem(pixmap)
         item.setPos(x_pos, y_pos)
+        self.scene.addItem(item)
+        self._positions[self._node_rows[node]] = (
+            x_pos + pixmap.width() / 2,
+            y_pos + pixmap.height() / 2,
+        )
+        return item
 
-        if not node.state:
-            item.setOpacity(0.2)
+    def _add_label(self, label, x_pos, y_pos):
+        """Add a node label at the given position"""
+        return NodeVisualizer.add_label(self.scene, label, x_pos, y_pos)
 
-        scene.addItem(item)
-        node_positions[node] = (x_pos + pixmap.width() / 2, y_pos + pixmap.height() / 2)
+    def _add_haps(self, node, x_pos, pixmap):
+        y_pos = 100
+        item = self._add_pixmap_item(node, pixmap, x_pos, y_pos)
 
-        text = scene.addText(f"BS {node.node_id}")
-        text.setDefaultTextColor(QtGui.QColor("white"))
-        text.setPos(
-            x_pos + pixmap.width() / 2 - text.boundingRect().width() / 2,
+        label = f"HAPS {node.node_id}"
+        text = self._add_label(
+            label,
+            x_pos + pixmap.width() / 2 - self._label_width(self.scene, label) / 2,
+            y_pos - 20,
+        )
+        self._node_items[node] = (item, text)
+        self._powered_items[node] = item
+
+    def _add_base_station(self, node, x_pos, pixmap):
+        y_pos = 250
+        item = self._add_pixmap_item(node, pixmap, x_pos, y_pos)
+
+        label = f"BS {node.node_id}"
+        text = self._add_label(
+            label,
+            x_pos + pixmap.width() / 2 - self._label_width(self.scene, label) / 2,
             y_pos + pixmap.height() + 5,
         )
+        self._node_items[node] = (item, text)
+        self._powered_items[node] = item
 
-    @staticmethod
-    def _add_user(scene, node, pixmap, node_positions):
-        x_pos = node.position.x * 50
+    def _add_user(self, node, x_pos, pixmap):
         y_pos = 270
+        item = self._add_pixmap_item(node, pixmap, x_pos, y_pos)
+        self._node_items[node] = (item,)
+
+    def _add_leo(self, node, pixmap):
         item = QtWidgets.QGraphicsPixmapItem(pixmap)
-        item.setPos(x_pos, y_pos)
-        scene.addItem(item)
-        node_positions[node] = (x_pos + pixmap.width() / 2, y_pos + pixmap.height() / 2)
+        self.scene.addItem(item)
+        text = self._add_label("", 0, 0)
+        self._node_items[node] = (item, text)
+        self._powered_items[node] = item
+        self._leo_items[node] = (item, text)
+
+    def _update_leos(self, network, angles):
+        """Move the satellites along the top of the view
+
+        Args:
+            angles: Orbital angle of each LEO satellite, in degrees
+        """
+        if not network.leo_nodes:
+            return
 
-    @staticmethod
-    def _add_leo(scene, node, pixmap, node_positions):
+        # Map the orbital angles of all satellites to scene x coordinates at once
         view_width = 400
         angle_range = abs(LEO.initial_angle - LEO.final_angle)
-        x_pos = (
-            (node.current_angle - LEO.initial_angle) / angle_range
+        x_positions = (
+            (angles - LEO.initial_angle) / angle_range
         ) * view_width - view_width / 2
-        y_pos = 50
+        visible = (angles >= LEO.initial_angle) & (angles <= LEO.final_angle)
+
+        for node, angle, x_pos, is_visible in zip(
+            network.leo_nodes,
+            angles.tolist(),
+            x_positions.tolist(),
+            visible.tolist(),
+        ):
+            self._update_leo(node, angle, x_pos, is_visible)
+
+    def _update_leo(self, node, angle, x_pos, is_visible):
+        """Move a satellite and refresh its label, hiding it out of sight"""
+        item, text = self._leo_items[node]
+        item.setVisible(is_visible)
+        text.setVisible(is_visible)
+        if not is_visible:
+            self._positions[self._node_rows[node]] = np.nan
+            return
 
-        item = QtWidgets.QGraphicsPixmapItem(pixmap)
+        y_pos = 50
+        pixmap = item.pixmap()
         item.setPos(x_pos, y_pos)
+        self._positions[self._node_rows[node]] = (
+            x_pos + pixmap.width() / 2,
+            y_pos + pixmap.height() / 2,
+        )
 
-        if not node.state:
-            item.setOpacity(0.2)
+        text.setText(f"LEO {node.node_id}\nAngle: {angle:.1f}°")
+        NodeVisualizer.move_label(text, x_pos, y_pos - 40)
 
-        scene.addItem(item)
-        node_positions[node] = (x_pos + pixmap.width() / 2, y_pos + pixmap.height() / 2)
+    def _draw_links(self, network, in_transit, shown_requests):
+        paths = [QtGui.QPainterPath() for _ in CloseUpView.LINK_PENS]
+        if not network.communication_links:
+            self._set_link_paths(paths)
+            return
 
-        text = scene.addText(f"LEO {node.node_id}\nAngle: {node.current_angle:.1f}°")
-        text.setDefaultTextColor(QtGui.QColor("white"))
-        text.setPos(x_pos, y_pos - 40)
+        # Look up both ends of every link in the node position table
+        endpoints = network.link_endpoints()
+        sources_xy = self._positions[endpoints[:, 0]]
+        targets_xy = self._positions[endpoints[:, 1]]
 
-    @staticmethod
-    def _draw_links(scene, simulation, node_positions):
-        for link in simulation.network.communication_links:
-            source_pos = node_positions.get(link.node_a)
-            target_pos = node_positions.get(link.node_b)
-
-            if source_pos and target_pos:
-                color = CloseUpView._get_link_color(link.node_a, link.node_b)
-                pen = QtGui.QPen(QtGui.QColor(color))
-                pen.setStyle(QtCore.Qt.SolidLine)
-                pen.setWidth(1)
-
-                line = scene.addLine(
-                    source_pos[0],
-                    source_pos[1],
-                    target_pos[0],
-                    target_pos[1],
-                    pen,
-                )
-                line.setOpacity(0.5)
+        # Links towards nodes that are not drawn (hidden LEO) are skipped
+        drawn = np.flatnonzero(
+            ~(np.isnan(sources_xy[:, 0]) | np.isnan(targets_xy[:, 0]))
+        )
 
-                NodeVisualizer.add_in_transit_requests(
-                    scene, link, source_pos, target_pos
-                )
+        for link_id, source_pos, target_pos, color_id in zip(
+            drawn.tolist(),
+            sources_xy[drawn].tolist(),
+            targets_xy[drawn].tolist(),
+            self._link_color_ids[drawn].tolist(),
+        ):
+            path = paths[color_id]
+            path.moveTo(source_pos[0], source_pos[1])
+            path.lineTo(target_pos[0], target_pos[1])
+
+            for request_id, x, y in NodeVisualizer.in_transit_positions(
+                in_transit.get(link_id, ()), source_pos, target_pos
+            ):
+                self._place_request(request_id, x, y)
+                shown_requests.add(request_id)
+
+        self._set_link_paths(paths)
 
     @staticmethod
-    def _get_link_color(source, target):
-        if isinstance(source, LEO) or isinstance(target, LEO):
-            return "cyan"
-        if isinstance(source, BaseStation) or isinstance(target, BaseStation):
-            return "yellow"
-        if isinstance(source, HAPS) or isinstance(target, HAPS):
-            return "orange"
-        return "white"
+    def _get_link_color_id(source, target):
+        """Get the index in LINK_COLORS of the color of a link"""
+        color_ids = CloseUpView.LINK_COLOR_IDS
+        default = CloseUpView.DEFAULT_LINK_COLOR_ID
+        return min(
+            color_ids.get(type(source), default), color_ids.get(type(target), default)
+        )
 
 
 class FarView:
     """Far view (Orbit view)"""
 
+    # Drawing resources shared by every rebuild of the scene
+    EARTH_PEN = QtGui.QPen(QtGui.QColor("blue"))
+    EARTH_BRUSH = QtGui.QBrush(QtGui.QColor("green"))
+    ORBIT_PEN = QtGui.QPen(QtGui.QColor("gray"), 1, QtCore.Qt.PenStyle.DashLine)
+    LABEL_BRUSH = QtGui.QBrush(QtGui.QColor("white"))
+    HAPS_ANGLE_PER_UNIT = math.radians(30)  # HAPS x position to orbit angle
+
+    # Cosine and sine of evenly spaced orbit angles, a step is well under a pixel
+    TRIG_TABLE_SIZE = 4096
+    _COS_TABLE = np.cos(np.arange(TRIG_TABLE_SIZE) * (2 * math.pi / TRIG_TABLE_SIZE))
+    _SIN_TABLE = np.sin(np.arange(TRIG_TABLE_SIZE) * (2 * math.pi / TRIG_TABLE_SIZE))
+
+    NODE_ICON_SIZE = 20
+
+    _scene = None  # Scene currently showing the nodes
+    _node_items = []  # (node row, icon, label, icon width) of the current scene
+    _synced = None  # (scene, network, network version) of the node items
+
     @staticmethod
-    def load(view, simulation, is_dark_theme=True):
-        """Load the far view of the network"""
+    def load(view, network, state, is_dark_theme=True):
+        """Load the far view of the network
+
+        Args:
+            network: Network whose nodes are drawn, None to clear
+            state: NetworkSnapshot of the network, to draw its nodes with
+        """
         view_width = view.width()
         view_height = view.height()
 
+        # The static scene only changes with the view state, the node items
+        # with the topology, otherwise the nodes are only moved
+        scene = FarView._static_scene(view_width, view_height, is_dark_theme)
+        if network is None or state is None:
+            FarView._remove_nodes()
+        elif state.version == network.version:
+            if FarView._synced != (scene, network, network.version):
+                FarView._build_nodes(scene, network)
+            earth_radius = FarView._earth_radius(view_width, view_height)
+            FarView._place_nodes(network, state, earth_radius + 75, earth_radius + 3)
+
+        if view.scene() is not scene:
+            view.setScene(scene)
+        view.fitInView(scene.sceneRect(), QtCore.Qt.AspectRatioMode.KeepAspectRatio)
+        view.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        view.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+
+    @staticmethod
+    def _earth_radius(view_width, view_height):
+        """Get the radius of the Earth for a view size"""
+        return min(view_width, view_height) * 0.3
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _static_scene(view_width, view_height, is_dark_theme):
+        """Build a scene with the background, Earth and orbits of a view state"""
         scene = QtWidgets.QGraphicsScene(
             -view_width / 2, -view_height / 2, view_width, view_height
         )
+        # The nodes move every frame, do not reindex them
+        scene.setItemIndexMethod(QtWidgets.QGraphicsScene.ItemIndexMethod.NoIndex)
 
         theme = ThemeManager.DARK_THEME if is_dark_theme else ThemeManager.LIGHT_THEME
 
         # Add background
-        scene.addRect(
-            -view_width / 2,
-            -view_height / 2,
-            view_width,
-            view_height,
-            QtGui.QPen(QtGui.QColor(theme["app_background"])),
-            QtGui.QBrush(QtGui.QColor(theme["app_background"])),
-        )
+        scene.setBackgroundBrush(QtGui.QColor(theme["app_background"]))
 
         # Calculate radii
-        earth_radius = min(view_width, view_height) * 0.3
+        earth_radius = FarView._earth_radius(view_width, view_height)
         haps_radius = earth_radius + 3
         leo_radius = earth_radius + 75
 
         # Add Earth
-        scene.addEllipse(
-            -earth_radius,
-            -earth_radius,
-            2 * earth_radius,
-            2 * earth_radius,
-            QtGui.QPen(QtGui.QColor("blue")),
-            QtGui.QBrush(QtGui.QColor("green")),
-        )
+        static_items = [
+            scene.addEllipse(
+                -earth_radius,
+                -earth_radius,
+                2 * earth_radius,
+                2 * earth_radius,
+                FarView.EARTH_PEN,
+                FarView.EARTH_BRUSH,
+            )
+        ]
 
         # Add orbit circles
         for radius in [haps_radius, leo_radius]:
-            scene.addEllipse(
-                -radius,
-                -radius,
-                2 * radius,
-                2 * radius,
-                QtGui.QPen(QtGui.QColor("gray"), 1, QtCore.Qt.PenStyle.DashLine),
+            static_items.append(
+                scene.addEllipse(
+                    -radius,
+                    -radius,
+                    2 * radius,
+                    2 * radius,
+                    FarView.ORBIT_PEN,
+                )
             )
 
-        if simulation:
-            FarView._add_nodes(scene, simulation.network.nodes, leo_radius, haps_radius)
+        # These never change, repaint them from pixmaps rather than paths
+        for item in static_items:
+            item.setCacheMode(QtWidgets.QGraphicsItem.CacheMode.DeviceCoordinateCache)
 
-        view.setScene(scene)
-        view.fitInView(scene.sceneRect(), QtCore.Qt.AspectRatioMode.KeepAspectRatio)
-        view.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        view.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        return scene
+
+    @staticmethod
+    def _remove_nodes():
+        """Remove the node items of the previous topology"""
+        for _, icon, label, _ in FarView._node_items:
+            FarView._scene.removeItem(icon)
+            FarView._scene.removeItem(label)
+        FarView._node_items = []
+        FarView._synced = None
 
     @staticmethod
     def reset(view):
@@ -245,59 +510,80 @@ class FarView:
         view.setScene(None)
 
     @staticmethod
-    def _add_nodes(scene, nodes, leo_radius, haps_radius):
-        """Add nodes with images to the far view"""
-        # Load node images
-        leo_pixmap = QtGui.QPixmap("images/leo.png").scaled(20, 20)
-        haps_pixmap = QtGui.QPixmap("images/haps.png").scaled(20, 20)
-
-        for node in nodes:
-            if isinstance(node, LEO):
-                FarView._add_leo(scene, node, leo_radius, leo_pixmap)
-            elif isinstance(node, HAPS):
-                FarView._add_haps(scene, node, haps_radius, haps_pixmap)
-
-    @staticmethod
-    def _add_leo(scene, node, radius, pixmap):
-        """Add LEO satellite with image"""
-        angle_rad = math.radians(node.current_angle)
-        x = radius * math.cos(angle_rad)
-        y = -radius * math.sin(angle_rad)
-
-        # Add LEO image
-        item = QtWidgets.QGraphicsPixmapItem(pixmap)
-        # Center the image on the calculated position
-        item.setPos(x - pixmap.width() / 2, y - pixmap.height() / 2)
+    def _build_nodes(scene, network):
+        """Create the items of every HAPS and LEO node, HAPS first"""
+        FarView._remove_nodes()
 
-        if not node.state:
-            item.setOpacity(0.2)
+        # Node images are decoded in the background, redraw once they are ready
+        assets = Assets.instance()
+        if not assets.is_ready("leo", "haps"):
+            return
 
-        scene.addItem(item)
+        size = FarView.NODE_ICON_SIZE
+        pixmaps = {
+            HAPS: assets.scaled_pixmap("haps", size, size),
+            LEO: assets.scaled_pixmap("leo", size, size),
+        }
+        node_rows = {node: i for i, node in enumerate(network.nodes)}
+        for node in network.haps_nodes + network.leo_nodes:
+            pixmap = pixmaps[type(node)]
+            icon = QtWidgets.QGraphicsPixmapItem(pixmap)
+            # Center the image on the position of the item
+            icon.setOffset(-pixmap.width() / 2, -pixmap.height() / 2)
+            scene.addItem(icon)
+            label = NodeVisualizer.add_label(
+                scene,
+                node.display_key,
+                0,
+                0,
+                FarView.LABEL_BRUSH,
+            )
+            FarView._node_items.append((node_rows[node], icon, label, pixmap.width()))
 
-        # Add text label
-        text = scene.addText(f"LEO {node.node_id}")
-        text.setDefaultTextColor(QtGui.QColor("white"))
-        text.setPos(x + pixmap.width(), y)
+        FarView._scene = scene
+        FarView._synced = (scene, network, network.version)
 
     @staticmethod
-    def _add_haps(scene, node, radius, pixmap):
-        """Add HAPS with image"""
-        # Calculate position based on node's x position
-        angle_rad = math.radians(node.position.x * 30)  # Scale x position to angle
-        x = radius * math.cos(angle_rad)
-        y = -radius * math.sin(angle_rad)
-
-        # Add HAPS image
-        item = QtWidgets.QGraphicsPixmapItem(pixmap)
-        # Center the image on the calculated position
-        item.setPos(x - pixmap.width() / 2, y - pixmap.height() / 2)
+    def _place_nodes(network, state, leo_radius, haps_radius):
+        """Move every node item to the orbit position of its node"""
+        if not FarView._node_items:
+            return
 
-        if not node.state:
-            item.setOpacity(0.2)
+        # Place every node of a type on its orbit in one vectorized pass
+        haps_angles = network.node_positions_x(HAPS) * FarView.HAPS_ANGLE_PER_UNIT
+        leo_angles = np.deg2rad(state.leo_angles)
+        positions = np.concatenate(
+            (
+                FarView._orbit_positions(haps_angles, haps_radius),
+                FarView._orbit_positions(leo_angles, leo_radius),
+            )
+        )
 
-        scene.addItem(item)
+        node_states = state.node_states.tolist()
+        for (row, icon, label, width), (x, y) in zip(
+            FarView._node_items, positions.tolist()
+        ):
+            icon.setPos(x, y)
+            icon.setOpacity(1.0 if node_states[row] else 0.2)
+            NodeVisualizer.move_label(label, x + width, y)
 
-        # Add text label
-        text = scene.addText(f"HAPS {node.node_id}")
-        text.setDefaultTextColor(QtGui.QColor("white"))
-        text.setPos(x + pixmap.width(), y)
+    @staticmethod
+    def _orbit_positions(angles, radius):
+        """Get the (x, y) scene coordinates of nodes on an orbit
+
+        Args:
+            angles: Orbit angles of the nodes, in radians
+            radius: Orbit radius in scene units
+
+        Returns:
+            np.ndarray: (nodes, 2) array, y pointing down as in the scene
+        """
+        # Look the angles up in the tables, wrapping them to a single turn
+        steps = np.rint(angles * (FarView.TRIG_TABLE_SIZE / (2 * math.pi)))
+        indices = steps.astype(np.intp) % FarView.TRIG_TABLE_SIZE
+
+        positions = np.empty((angles.size, 2))
+        np.take(FarView._COS_TABLE, indices, out=positions[:, 0])
+        np.take(FarView._SIN_TABLE, indices, out=positions[:, 1])
+        positions *= (radius, -radius)
+        return positions
@@ -21,7 +21,11 @@ class Position:
 
     def distance_to(self, other: "Position") -> float:
         """Calculate distance using numpy operations."""
-        return np.sqrt(np.sum((self.coords - other.coords) ** 2))
+        return np.sqrt(self.distance_squared_to(other))
+
+    def distance_squared_to(self, other: "Position") -> float:
+        """Calculate the squared distance, enough to compare distances."""
+        return np.sum((self.coords - other.coords) ** 2)
 
     def __str__(self):
         return f"Position(x={self.x}, y={self.y})"
@@ -0,0 +1,56 @@
+import unittest
+
+import numpy as np
+
+from optimisation_ntn.matrices.decision_matrices import DecisionMatrices, MatrixType
+from optimisation_ntn.networks.network import Network
+from optimisation_ntn.networks.request import Request, RequestStatus
+from optimisation_ntn.nodes.base_station import BaseStation
+from optimisation_ntn.nodes.haps import HAPS
+from optimisation_ntn.nodes.user_device import UserDevice
+from optimisation_ntn.utils.position import Position
+
+
+class TestAssignmentMatrix(unittest.TestCase):
+    def setUp(self):
+        """Set up test fixtures"""
+        self.network = Network()
+        self.decision_matrices = DecisionMatrices()
+
+        self.haps = HAPS(node_id=0, initial_position=Position(0, 20000))
+        self.bs = BaseStation(node_id=1, initial_position=Position(0, 0))
+        self.user1 = UserDevice(node_id=2, initial_position=Position(0, 0))
+        self.user2 = UserDevice(node_id=3, initial_position=Position(100, 0))
+
+        self.network.add_nodes([self.haps, self.bs, self.user1, self.user2])
+
+    def _add_request(self, user, node, status):
+        """Add a request of a user currently at a node"""
+        request = Request(0, 0.1, user, lambda: 0.0)
+        request.current_node = node
+        request.status = status
+        user.current_requests.append(request)
+
+    def test_processing_requests(self):
+        """Test that only processing requests mark their compute node"""
+        self._add_request(self.user1, self.bs, RequestStatus.PROCESSING)
+        self._add_request(self.user2, self.haps, RequestStatus.IN_PROCESSING_QUEUE)
+
+        self.decision_matrices.update_assignment_matrix(self.network)
+        assignment_matrix = self.decision_matrices.get_matrix(MatrixType.ASSIGNMENT)
+
+        # Columns follow the compute nodes, HAPS first then base stations
+        np.testing.assert_array_equal(assignment_matrix, [[0, 1], [0, 0]])
+
+    def test_update_clears_previous_assignments(self):
+        """Test that finished requests are cleared when the matrix is reused"""
+        self._add_request(self.user1, self.bs, RequestStatus.PROCESSING)
+        self.decision_matrices.update_assignment_matrix(self.network)
+        snapshot = self.decision_matrices.get_snapshot()
+
+        self.user1.current_requests[0].status = RequestStatus.COMPLETED
+        self.decision_matrices.update_assignment_matrix(self.network)
+        assignment_matrix = self.decision_matrices.get_matrix(MatrixType.ASSIGNMENT)
+
+        np.testing.assert_array_equal(assignment_matrix, np.zeros((2, 2)))
+        np.testing.assert_array_equal(snapshot[MatrixType.ASSIGNMENT], [[0, 1], [0, 0]])
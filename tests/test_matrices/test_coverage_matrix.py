@@ -34,9 +34,7 @@ class TestDecisionMatrices(unittest.TestCase):
         self.decision_matrices.generate_coverage_matrix(
             self.network, coverage_radius=5000
         )
-        coverage_matrix = self.decision_matrices.get_matrix(
-            MatrixType.COVERAGE_ZONE
-        ).data
+        coverage_matrix = self.decision_matrices.get_matrix(MatrixType.COVERAGE_ZONE)
 
         expected_matrix = np.array(
             [
@@ -57,9 +55,7 @@ class TestDecisionMatrices(unittest.TestCase):
         self.decision_matrices.generate_coverage_matrix(
             self.network, coverage_radius=1500
         )
-        coverage_matrix = self.decision_matrices.get_matrix(
-            MatrixType.COVERAGE_ZONE
-        ).data
+        coverage_matrix = self.decision_matrices.get_matrix(MatrixType.COVERAGE_ZONE)
 
         expected_matrix = np.array(
             [
@@ -78,9 +74,7 @@ class TestDecisionMatrices(unittest.TestCase):
     def test_zero_coverage_radius(self):
         """Test coverage zones with 0m radius - no connections should be made"""
         self.decision_matrices.generate_coverage_matrix(self.network, coverage_radius=0)
-        coverage_matrix = self.decision_matrices.get_matrix(
-            MatrixType.COVERAGE_ZONE
-        ).data
+        coverage_matrix = self.decision_matrices.get_matrix(MatrixType.COVERAGE_ZONE)
 
         expected_matrix = np.zeros((3, 3))
 
@@ -89,3 +83,23 @@ class TestDecisionMatrices(unittest.TestCase):
             expected_matrix,
             err_msg=f"Coverage matrix with 0m radius should be all zeros.\nGot:\n{coverage_matrix}",
         )
+
+    def test_equidistant_base_stations(self):
+        """Test that every closest base station is marked when distances tie"""
+        user4 = UserDevice(node_id=6, initial_position=Position(2500, 0))
+        self.network.add_node(user4)
+        self.decision_matrices.generate_coverage_matrix(
+            self.network, coverage_radius=5000
+        )
+        coverage_matrix = self.decision_matrices.get_matrix(MatrixType.COVERAGE_ZONE)
+
+        np.testing.assert_array_equal(coverage_matrix[3], [0, 1, 1])
+
+    def test_no_base_stations(self):
+        """Test coverage zones of a network without base stations"""
+        network = Network()
+        network.add_node(UserDevice(node_id=0, initial_position=Position(0, 0)))
+        self.decision_matrices.generate_coverage_matrix(network)
+        coverage_matrix = self.decision_matrices.get_matrix(MatrixType.COVERAGE_ZONE)
+
+        self.assertEqual(coverage_matrix.shape, (1, 0))
@@ -15,7 +15,7 @@ class TestRequestMatrix(unittest.TestCase):
         num_steps = 5
 
         self.decision_matrices.generate_request_matrix(num_requests, num_steps)
-        request_matrix = self.decision_matrices.get_matrix(MatrixType.REQUEST).data
+        request_matrix = self.decision_matrices.get_matrix(MatrixType.REQUEST)
 
         self.assertEqual(
             request_matrix.shape,
@@ -33,7 +33,7 @@ class TestRequestMatrix(unittest.TestCase):
         num_steps = 10
 
         self.decision_matrices.generate_request_matrix(num_requests, num_steps)
-        request_matrix = self.decision_matrices.get_matrix(MatrixType.REQUEST).data
+        request_matrix = self.decision_matrices.get_matrix(MatrixType.REQUEST)
 
         # Test each row sums to 1 (one request per user)
         row_sums = np.sum(request_matrix, axis=1)
@@ -50,6 +50,7 @@ class TestRequestMatrix(unittest.TestCase):
             [0, 1],
             err_msg="Matrix should only contain 0s and 1s",
         )
+        self.assertEqual(request_matrix.dtype, np.uint8)
 
         # Test total number of requests
         total_requests = np.sum(request_matrix)
@@ -63,22 +64,60 @@ class TestRequestMatrix(unittest.TestCase):
         """Test edge cases for request matrix generation"""
         # Test with single request and single time step
         self.decision_matrices.generate_request_matrix(num_requests=1, num_steps=1)
-        request_matrix = self.decision_matrices.get_matrix(MatrixType.REQUEST).data
+        request_matrix = self.decision_matrices.get_matrix(MatrixType.REQUEST)
         self.assertEqual(request_matrix.shape, (1, 1))
         self.assertEqual(request_matrix[0, 0], 1)
 
         # Test with single request over multiple time steps
         self.decision_matrices.generate_request_matrix(num_requests=1, num_steps=5)
-        request_matrix = self.decision_matrices.get_matrix(MatrixType.REQUEST).data
+        request_matrix = self.decision_matrices.get_matrix(MatrixType.REQUEST)
         self.assertEqual(request_matrix.shape, (1, 5))
         self.assertEqual(np.sum(request_matrix), 1)
 
         # Test with multiple requests in single time step
         self.decision_matrices.generate_request_matrix(num_requests=5, num_steps=1)
-        request_matrix = self.decision_matrices.get_matrix(MatrixType.REQUEST).data
+        request_matrix = self.decision_matrices.get_matrix(MatrixType.REQUEST)
         self.assertEqual(request_matrix.shape, (5, 1))
         np.testing.assert_array_equal(request_matrix, np.ones((5, 1)))
 
+    def test_time_buffer(self):
+        """Test that the time buffer adds empty steps but no users"""
+        self.decision_matrices.generate_request_matrix(
+            num_requests=20, num_steps=30, time=0.1, time_buffer=1
+        )
+        request_matrix = self.decision_matrices.get_matrix(MatrixType.REQUEST)
+        self.assertEqual(request_matrix.shape, (20, 30))
+        self.assertEqual(np.sum(request_matrix[:, 20:]), 0)
+        np.testing.assert_array_equal(np.sum(request_matrix, axis=1), np.ones(20))
+
+    def test_requesting_users(self):
+        """Test that the users of each step match the request matrix columns"""
+        self.decision_matrices.generate_request_matrix(num_requests=30, num_steps=10)
+        request_matrix = self.decision_matrices.get_matrix(MatrixType.REQUEST)
+        for step in range(10):
+            np.testing.assert_array_equal(
+                self.decision_matrices.requesting_users(step),
+                np.flatnonzero(request_matrix[:, step]),
+            )
+
+        request_matrix = np.array([[0, 1, 0], [1, 0, 0], [0, 1, 1]], dtype=np.uint8)
+        self.decision_matrices.set_matrix(MatrixType.REQUEST, request_matrix)
+        np.testing.assert_array_equal(
+            self.decision_matrices.requesting_users(1), [0, 2]
+        )
+        np.testing.assert_array_equal(self.decision_matrices.requesting_users(2), [2])
+
+    def test_regeneration_keeps_set_matrix(self):
+        """Test that regenerating does not write into an array given to set_matrix"""
+        requests = np.ones((4, 6), dtype=np.uint8)
+        self.decision_matrices.set_matrix(MatrixType.REQUEST, requests[:, :3])
+
+        self.decision_matrices.generate_request_matrix(num_requests=4, num_steps=3)
+
+        np.testing.assert_array_equal(requests, 1)
+        request_matrix = self.decision_matrices.get_matrix(MatrixType.REQUEST)
+        np.testing.assert_array_equal(request_matrix.sum(axis=1), 1)
+
     def test_invalid_inputs(self):
         """Test handling of invalid inputs"""
         with self.assertRaises(ValueError):
@@ -0,0 +1,86 @@
+import unittest
+
+import numpy as np
+
+from optimisation_ntn.networks.network import Network
+from optimisation_ntn.nodes.base_station import BaseStation
+from optimisation_ntn.nodes.haps import HAPS
+from optimisation_ntn.nodes.leo import LEO
+from optimisation_ntn.nodes.user_device import UserDevice
+from optimisation_ntn.utils.position import Position
+
+
+class TestNetwork(unittest.TestCase):
+    def setUp(self):
+        self.network = Network()
+        self.network.add_node(BaseStation(0, Position(-1.5, 0)))
+        self.network.add_node(BaseStation(1, Position(1.5, 0)))
+        self.network.add_node(HAPS(0, Position(0, 20)))
+        self.network.add_node(UserDevice(0, Position(1, -2)))
+
+    def test_node_positions_x(self):
+        np.testing.assert_array_equal(
+            self.network.node_positions_x(BaseStation), [-1.5, 1.5]
+        )
+        np.testing.assert_array_equal(self.network.node_positions_x(HAPS), [0.0])
+
+    def test_node_positions(self):
+        np.testing.assert_array_equal(
+            self.network.node_positions(BaseStation), [[-1.5, 0.0], [1.5, 0.0]]
+        )
+        self.assertEqual(self.network.node_positions(LEO).shape, (0, 2))
+
+    def test_node_positions_refreshed_on_topology_change(self):
+        self.network.node_positions_x(UserDevice)
+        self.network.add_node(UserDevice(1, Position(-3, -2)))
+        np.testing.assert_array_equal(
+            self.network.node_positions_x(UserDevice), [1.0, -3.0]
+        )
+
+    def test_leo_angles(self):
+        self.assertEqual(self.network.leo_angles().size, 0)
+        self.network.add_node(LEO(0, start_angle=-10))
+        self.network.add_node(LEO(1, start_angle=5))
+        self.network.leo_nodes[0].tick(1)
+        np.testing.assert_array_equal(
+            self.network.leo_angles(),
+            [leo.current_angle for leo in self.network.leo_nodes],
+        )
+
+    def test_link_endpoints(self):
+        endpoints = self.network.link_endpoints()
+        self.assertEqual(endpoints.shape, (len(self.network.communication_links), 2))
+        for link, (a, b) in zip(self.network.communication_links, endpoints):
+            self.assertIs(self.network.nodes[a], link.node_a)
+            self.assertIs(self.network.nodes[b], link.node_b)
+
+    def test_version_changes_with_topology(self):
+        version = self.network.version
+        self.network.add_node(UserDevice(1, Position(-3, -2)))
+        self.assertGreater(self.network.version, version)
+
+        version = self.network.version
+        self.network.remove_nodes(UserDevice)
+        self.assertGreater(self.network.version, version)
+
+    def test_node_by_key(self):
+        self.assertIs(self.network.node_by_key["HAPS 0"], self.network.haps_nodes[0])
+        self.assertEqual(len(self.network.node_by_key), len(self.network.nodes))
+
+        self.network.remove_nodes(UserDevice)
+        self.assertNotIn("UserDevice 0", self.network.node_by_key)
+
+    def test_remove_nodes(self):
+        self.network.remove_nodes(UserDevice)
+        self.assertEqual(self.network.user_nodes, [])
+        self.assertEqual(self.network.node_positions_x(UserDevice).size, 0)
+        self.assertTrue(
+            all(
+                not isinstance(link.node_a, UserDevice)
+                for link in self.network.communication_links
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
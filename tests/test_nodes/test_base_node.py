@@ -0,0 +1,32 @@
+import unittest
+
+import numpy as np
+
+from optimisation_ntn.nodes.base_station import BaseStation
+from optimisation_ntn.utils.position import Position
+
+
+class TestBaseNode(unittest.TestCase):
+    def test_energy_history_grows_past_capacity(self):
+        node = BaseStation(0, Position(0, 0))
+        node.state = True
+        ticks = 3 * node.ENERGY_HISTORY_CAPACITY + 5
+        for _ in range(ticks):
+            node.tick(0.1)
+
+        history = node.energy_history
+        self.assertEqual(history.dtype, np.float32)
+        self.assertEqual(len(history), ticks)
+        self.assertAlmostEqual(history[-1], node.tick_energy, places=5)
+        self.assertAlmostEqual(
+            float(history.sum(dtype=np.float64)), node.energy_consumed, places=2
+        )
+
+    def test_empty_energy_history(self):
+        node = BaseStation(0, Position(0, 0))
+        self.assertEqual(len(node.energy_history), 0)
+        self.assertEqual(node.tick_energy, 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
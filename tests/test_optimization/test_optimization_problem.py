@@ -0,0 +1,83 @@
+import unittest
+
+import numpy as np
+
+from optimisation_ntn.optimization.optimization_problem import OptimizationProblem
+from optimisation_ntn.simulation import Simulation, SimulationConfig
+
+
+class TestOptimizationProblem(unittest.TestCase):
+    def setUp(self):
+        self.simulation = Simulation(
+            SimulationConfig(seed=42, max_time=2, save_results=False)
+        )
+        self.n_nodes = len(self.simulation.network.compute_nodes)
+        self.problem = OptimizationProblem(
+            self.simulation, self.simulation.user_count, self.n_nodes
+        )
+        self.runs = 0
+        run_with_assignment = self.simulation.run_with_assignment
+
+        def counted_run(assignment_vector):
+            self.runs += 1
+            return run_with_assignment(assignment_vector)
+
+        self.simulation.run_with_assignment = counted_run
+
+    def test_repeated_vectors_are_simulated_once(self):
+        x = np.zeros((1, self.simulation.user_count), dtype=int)
+        first, second = {}, {}
+        self.problem._evaluate(x, first)
+        self.problem._evaluate(x.copy(), second)
+
+        self.assertEqual(self.runs, 1)
+        np.testing.assert_array_equal(first["F"], second["F"])
+        np.testing.assert_array_equal(first["G"], second["G"])
+
+        x[0, 0] = self.n_nodes - 1
+        self.problem._evaluate(x, {})
+        self.assertEqual(self.runs, 2)
+
+    def test_population_duplicates_are_simulated_once(self):
+        x = np.zeros((3, self.simulation.user_count), dtype=int)
+        x[1] = self.n_nodes - 1
+        out = {}
+        self.problem._evaluate(x, out)
+
+        self.assertEqual(self.runs, 2)
+        self.assertEqual(out["F"].shape, (3,))
+        self.assertEqual(out["F"][0], out["F"][2])
+
+    def test_vectors_are_compacted(self):
+        x = np.ones((1, self.simulation.user_count))
+        self.problem._evaluate(x, {})
+        self.problem._evaluate(x.astype(int), {})
+
+        self.assertEqual(self.runs, 1)
+        self.assertEqual(self.problem.vector_dtype, np.uint8)
+
+    def test_initial_fitness_is_the_first_population(self):
+        x = np.zeros((2, self.simulation.user_count), dtype=int)
+        x[1] = self.n_nodes - 1
+        self.problem._evaluate(x, {})
+        self.problem._evaluate(x[:1], {})
+
+        self.assertEqual(self.problem.initial_fitness.shape, (2, 2))
+
+    def test_cache_is_bounded(self):
+        self.problem.FITNESS_CACHE_SIZE = 2
+        vectors = [
+            np.full((1, self.simulation.user_count), i, dtype=int) for i in range(3)
+        ]
+        for x in vectors:
+            self.problem._evaluate(x, {})
+
+        # The first vector was evicted, the last one is still cached
+        self.problem._evaluate(vectors[2], {})
+        self.assertEqual(self.runs, 3)
+        self.problem._evaluate(vectors[0], {})
+        self.assertEqual(self.runs, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import pytest
+from optimisation_ntn.matrices.decision_matrices import MatrixType
 from optimisation_ntn.simulation import Simulation, SimulationConfig
 
 
@@ -11,3 +12,26 @@ def test_main_runs():
         assert total_energy is not None
     except Exception as e:
         pytest.fail(f"Main function raised an exception: {e}")
+
+
+def test_seeded_user_positions():
+    """Test that a seed reproduces the user positions, also after a reset"""
+    simulation = Simulation(config=SimulationConfig(seed=42))
+    positions = [user.position.x for user in simulation.network.user_nodes]
+    assert len(positions) == simulation.user_count
+    assert all(-4 <= x <= 4 for x in positions)
+
+    simulation.reset()
+    assert [user.position.x for user in simulation.network.user_nodes] == positions
+
+
+def test_reset_with_user_count():
+    """Test that a reset can change the number of users of a simulation"""
+    simulation = Simulation(config=SimulationConfig(seed=42, save_results=False))
+    simulation.reset(user_count=3)
+    assert len(simulation.network.user_nodes) == 3
+    assert simulation.matrices.get_matrix(MatrixType.REQUEST).shape[0] == 3
+
+    simulation.reset()
+    assert simulation.user_count == 3
+    assert simulation.run() > 0
@@ -0,0 +1,68 @@
+import unittest
+
+import numpy as np
+
+from optimisation_ntn.ui.downsample import lttb
+
+
+def reference_lttb(x_values, y_values, n_out):
+    """Straightforward LTTB, one point at a time"""
+    size = len(x_values)
+    bucket_size = (size - 2) / (n_out - 2)
+    picks = [0]
+    for i in range(n_out - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, size - 1)
+        if i == n_out - 3:
+            avg_x, avg_y = x_values[-1], y_values[-1]
+        else:
+            avg_x = np.mean(x_values[end:next_end])
+            avg_y = np.mean(y_values[end:next_end])
+        prev = picks[-1]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs(
+                (x_values[prev] - avg_x) * (y_values[j] - y_values[prev])
+                - (x_values[prev] - x_values[j]) * (avg_y - y_values[prev])
+            )
+            if area > best_area:
+                best, best_area = j, area
+        picks.append(best)
+    picks.append(size - 1)
+    return x_values[picks], y_values[picks]
+
+
+class TestLTTB(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.x = np.arange(1000, dtype=float)
+        self.y = rng.random(1000)
+
+    def test_short_series_unchanged(self):
+        x, y = lttb(self.x[:10], self.y[:10], 20)
+        np.testing.assert_array_equal(x, self.x[:10])
+        np.testing.assert_array_equal(y, self.y[:10])
+
+    def test_keeps_endpoints(self):
+        x, y = lttb(self.x, self.y, 100)
+        self.assertEqual(len(x), 100)
+        self.assertEqual((x[0], y[0]), (self.x[0], self.y[0]))
+        self.assertEqual((x[-1], y[-1]), (self.x[-1], self.y[-1]))
+
+    def test_keeps_peak(self):
+        y = np.zeros(1000)
+        y[457] = 10.0
+        _, sampled = lttb(self.x, y, 50)
+        self.assertEqual(sampled.max(), 10.0)
+
+    def test_matches_reference(self):
+        for n_out in (3, 17, 100, 999):
+            x, y = lttb(self.x, self.y, n_out)
+            ref_x, ref_y = reference_lttb(self.x, self.y, n_out)
+            np.testing.assert_array_equal(x, ref_x)
+            np.testing.assert_array_equal(y, ref_y)
+
+
+if __name__ == "__main__":
+    unittest.main()
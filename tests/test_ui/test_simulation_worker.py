@@ -0,0 +1,97 @@
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+from PySide6 import QtCore
+
+from optimisation_ntn.simulation import Simulation, SimulationConfig
+from optimisation_ntn.ui.simulation_worker import NetworkSnapshot, SimulationWorker
+
+
+class TestSimulationWorker(unittest.TestCase):
+    def setUp(self):
+        self.simulation = Simulation(
+            config=SimulationConfig(seed=42, save_results=False)
+        )
+        self.simulation.enable_stats_tracking()
+        self.worker = SimulationWorker(self.simulation, steps_per_second=100)
+
+    def test_snapshots_hold_every_energy_sample_once(self):
+        samples = []
+        for _ in range(5):
+            self.simulation.step()
+            snapshot = self.worker.snapshot(capture_nodes=False)
+            samples.extend(snapshot.new_energy_samples)
+
+        self.assertEqual(snapshot.energy_sample_count, 5)
+        self.assertEqual(samples, self.simulation.system_energy_history)
+
+    def test_node_energy_accumulates_between_captures(self):
+        self.simulation.step()
+        self.worker.snapshot(capture_nodes=True)
+        for _ in range(3):
+            self.simulation.step()
+        snapshot = self.worker.snapshot(capture_nodes=True)
+
+        for node in self.simulation.network.nodes:
+            energy = snapshot.nodes[node.display_key]
+            history = node.energy_history
+            self.assertEqual(energy.sample_count, len(history))
+            np.testing.assert_array_equal(energy.new_samples, history[1:])
+            self.assertAlmostEqual(energy.peak, history.max())
+            self.assertAlmostEqual(energy.average, history.mean(), places=5)
+
+    def test_network_state_is_captured_with_the_nodes(self):
+        self.simulation.step()
+        snapshot = self.worker.snapshot(capture_nodes=False)
+        self.assertEqual(snapshot.network is None, snapshot.nodes is None)
+
+        network = self.simulation.network
+        link = network.communication_links[0]
+        link.transmission_queue.extend(
+            [SimpleNamespace(id=7, size=100.0), SimpleNamespace(id=8, size=50.0)]
+        )
+        link.request_progress = 25.0
+        state = self.worker.snapshot(capture_nodes=True).network
+
+        self.assertEqual(state.version, network.version)
+        self.assertEqual(state.current_step, self.simulation.current_step)
+        self.assertEqual(
+            state.node_states.tolist(), [node.state for node in network.nodes]
+        )
+        np.testing.assert_array_equal(state.leo_angles, network.leo_angles())
+        self.assertEqual(state.in_transit, {0: ((7, 0.25), (8, 0.0))})
+
+        # Later steps do not change a captured state
+        link.transmission_queue.clear()
+        self.simulation.step()
+        self.assertEqual(state.in_transit, {0: ((7, 0.25), (8, 0.0))})
+        self.assertEqual(
+            NetworkSnapshot.from_simulation(self.simulation).in_transit, {}
+        )
+
+    def test_request_stats_are_copied(self):
+        self.simulation.step()
+        snapshot = self.worker.snapshot(capture_nodes=False)
+        self.assertEqual(
+            snapshot.request_state_stats, self.simulation.request_state_stats
+        )
+        self.assertIsNot(
+            snapshot.request_state_stats, self.simulation.request_state_stats
+        )
+
+    def test_step_errors_are_reported(self):
+        errors = []
+        self.worker.failed.connect(errors.append, QtCore.Qt.DirectConnection)
+
+        def failing_step():
+            raise ValueError("bad step")
+
+        self.simulation.step = failing_step
+        self.worker.run_loop()
+
+        self.assertEqual(errors, ["ValueError: bad step"])
+
+
+if __name__ == "__main__":
+    unittest.main()